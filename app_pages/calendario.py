@@ -0,0 +1,79 @@
+import datetime
+
+import streamlit as st
+
+from festival.data import locations_2025, locations_potential
+from festival.app_data import load_schedule
+
+# --- CALENDARIO DEGLI EVENTI ---
+st.header("Calendario degli Eventi")
+
+schedule = load_schedule()
+events = schedule.events
+editions = sorted(events["edizione"].unique(), reverse=True)
+
+
+def event_table(df, extra=()):
+    # Tabella leggibile: data, orario, luogo e tipo di evento
+    table = df.assign(
+        Data=df["inizio"].dt.strftime("%d/%m/%Y"),
+        Orario=df["inizio"].dt.strftime("%H:%M") + " - " + df["fine"].dt.strftime("%H:%M"),
+        Comune=df["comune"],
+        Sede=df["sede"],
+        Tipo=df["tipo"].str.capitalize(),
+    )
+    return table[["Data", "Orario", "Comune", "Sede", "Tipo", *extra]]
+
+
+col_edition, col_day = st.columns([1, 2])
+with col_edition:
+    edition = st.selectbox("Edizione", editions)
+season = events[events["edizione"] == edition]
+first_day, last_day = season["inizio"].min().date(), season["fine"].max().date()
+today = datetime.date.today()
+with col_day:
+    day = st.date_input(
+        "Giorno",
+        value=today if first_day <= today <= last_day else first_day,
+        min_value=first_day,
+        max_value=last_day,
+        format="DD/MM/YYYY",
+    )
+
+st.subheader(f"🎵 Eventi del {day:%d/%m/%Y}")
+day_events = schedule.on_day(day)
+if day_events.empty:
+    st.info("Nessun evento in programma in questo giorno.")
+else:
+    st.dataframe(event_table(day_events), hide_index=True, use_container_width=True)
+
+# --- PROSSIMI EVENTI VICINO A TE ---
+st.subheader("📍 Prossimi eventi vicino a te")
+places = {**locations_2025, **locations_potential}
+col_place, col_radius = st.columns([2, 1])
+with col_place:
+    place = st.selectbox("Mi trovo a", list(places))
+with col_radius:
+    radius = st.slider("Distanza massima (km)", 5, 60, 20, step=5)
+
+lat, lon = places[place]
+near = schedule.upcoming_near(lat, lon, datetime.datetime.combine(day, datetime.time()), radius_km=radius)
+if near.empty:
+    st.info(f"Nessun evento in programma entro {radius} km da {place} dal {day:%d/%m/%Y}.")
+else:
+    st.dataframe(
+        event_table(near, extra=("distanza_km",)).rename(columns={"distanza_km": "Distanza (km)"}),
+        hide_index=True, use_container_width=True,
+    )
+
+# --- PROGRAMMA COMPLETO E CONFLITTI ---
+with st.expander(f"Programma completo {edition} ({len(season)} eventi)"):
+    st.dataframe(event_table(season), hide_index=True, use_container_width=True)
+
+conflicts = schedule.conflicts()
+conflicts = conflicts[conflicts["edizione"] == edition]
+if conflicts.empty:
+    st.caption("✅ Nessuna sovrapposizione di orario nella stessa sede.")
+else:
+    st.warning(f"⚠️ {len(conflicts)} eventi si sovrappongono a un altro evento nella stessa sede.")
+    st.dataframe(event_table(conflicts), hide_index=True, use_container_width=True)
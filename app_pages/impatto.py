@@ -0,0 +1,136 @@
+import pandas as pd
+import streamlit as st
+
+from festival.app_data import historical_figures, load_event_data, series_pyramids
+from festival.data import compute_kpis, df_historical
+from festival.timeseries import DEFAULT_POINTS, SERIES, figure
+
+# --- SEZIONE 1: PREVISIONI DI IMPATTO 2025 ---
+st.header("Previsioni di Impatto per il 2025")
+
+# Metriche principali in quattro colonne, dagli stessi KPI serviti dall'API
+kpis = compute_kpis(df_historical, load_event_data())
+
+
+def growth(metric):
+    # +18.75%, +23.4%: le stesse cifre dell'API, senza zeri finali
+    value = f"{kpis['crescita_pct'][metric]:+.2f}".rstrip("0").rstrip(".")
+    return f'<small style="color: #27ae60;">{value}% vs {kpis["anno_confronto"]}</small>'
+
+
+def metric_card(value, label, note):
+    return f"""
+    <div class="single-metric">
+        <div class="single-metric-value">{value}</div>
+        <div class="single-metric-label">{label}</div>
+        {note}
+    </div>
+    """
+
+
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.markdown(metric_card(f"{kpis['pubblico']:,}".replace(",", "."), "👥 Pubblico in Presenza", growth("pubblico")),
+                unsafe_allow_html=True)
+
+with col2:
+    reach = f"{kpis['copertura'] / 1_000_000:.1f}".rstrip("0").rstrip(".") + " Mln"
+    st.markdown(metric_card(reach, "📱 Copertura Digitale", growth("copertura")), unsafe_allow_html=True)
+
+with col3:
+    events_note = f"<small>{kpis['concerti']} concerti + {kpis['masterclass']} masterclass</small>"
+    st.markdown(metric_card(kpis["eventi"], "🎵 Eventi Totali", events_note), unsafe_allow_html=True)
+
+with col4:
+    st.markdown(metric_card(kpis["comuni"], "🏘️ Comuni Coinvolti", growth("comuni")), unsafe_allow_html=True)
+
+# Spiegazione della copertura
+col1, col2 = st.columns([1, 2])
+
+with col1:
+    st.subheader("Cos'è la 'Copertura'?")
+    st.markdown("""
+    > La copertura (o "reach") è il numero totale di utenti unici che hanno visualizzato un contenuto del festival sui social media.
+    """)
+
+with col2:
+    st.subheader("Strategia di Crescita")
+    st.markdown("""
+    Per il 2025 si sta investendo in una campagna social ancora più capillare, con **campagne Instagram ADS geolocalizzate per ogni evento** e strategie di interazione diretta per incentivare la condivisione e la partecipazione del pubblico.
+    """)
+
+st.markdown("---")
+
+# --- GRAFICI STORICI ---
+st.subheader("Andamento Storico (2023-2025)")
+figures = historical_figures()
+
+tab1, tab2, tab3, tab4 = st.tabs(
+    ["📊 Grafico di Crescita", "📱 Copertura per Piattaforma", "📋 Dati Dettagliati", "📈 Stagione Ora per Ora"]
+)
+
+with tab1:
+    st.markdown("##### **Andamento Pubblico in Presenza**")
+    st.markdown(
+        "Un aumento costante del pubblico partecipante agli eventi, con una crescita stimata del "
+        f"**{kpis['crescita_pct']['pubblico']:+.2f}%** per il {kpis['anno']}."
+    )
+
+    st.plotly_chart(figures["pubblico"], use_container_width=True)
+
+    st.markdown("##### **Andamento Copertura Social**")
+    st.markdown("Una crescita esplosiva della visibilità online, trainata dagli investimenti strategici su Instagram.")
+
+    st.plotly_chart(figures["copertura"], use_container_width=True)
+
+with tab2:
+    st.markdown("##### **Copertura per Piattaforma Social**")
+
+    st.plotly_chart(figures["piattaforme"], use_container_width=True)
+
+    st.info("📈 **Nota**: Si sta investendo in una campagna più capillare sui social media per massimizzare la reach e l'engagement del pubblico.")
+
+with tab3:
+    st.markdown("##### **Riepilogo Dati Storici e Previsionali**")
+    st.markdown("I dati del 2023 e 2024 mostrano una forte crescita, che è alla base delle stime per il 2025.")
+
+    # Formattazione controllata per evitare virgole negli anni
+    st.dataframe(
+        df_historical.style.format({
+            "Pubblico in Presenza": "{:,.0f}",
+            "Copertura Totale": "{:,.0f}",
+            "Copertura Facebook": "{:,.0f}",
+            "Copertura Instagram": "{:,.0f}",
+            "Eventi Totali": "{:.0f}",
+            "Comuni Coinvolti": "{:.0f}"
+        }).set_properties(**{'text-align': 'left'}).set_table_styles([
+            dict(selector='th', props=[('text-align', 'left')])
+        ]),
+        use_container_width=True
+    )
+
+with tab4:
+    st.markdown("##### **Copertura e pubblico ora per ora**")
+    pyramids, estimated = series_pyramids()
+    available = [metric for metric in SERIES if metric in pyramids]
+    col_metric, col_detail = st.columns([3, 1])
+    with col_metric:
+        series_metric = st.radio("Serie", available, format_func=SERIES.get, horizontal=True)
+    with col_detail:
+        # Più dettaglio vuol dire più punti inviati al browser; oltre la soglia si passa a WebGL
+        max_points = st.select_slider("Dettaglio (punti)", [500, DEFAULT_POINTS, 10000, 50000], value=DEFAULT_POINTS)
+    pyramid = pyramids[series_metric]
+
+    # Lo zoom è una finestra sull'asse dei tempi: ogni spostamento interroga la piramide
+    # e trasferisce solo il dettaglio della finestra
+    first, last = (pd.Timestamp(t).to_pydatetime() for t in pyramid.extent)
+    window = st.slider("Periodo", min_value=first, max_value=last, value=(first, last),
+                       step=pd.Timedelta(hours=1).to_pytimedelta(), format="DD/MM/YY HH:mm")
+    x, y = pyramid.query(pd.Timestamp(window[0]).to_datetime64(), pd.Timestamp(window[1]).to_datetime64(), max_points)
+    st.plotly_chart(figure(x, y, SERIES[series_metric]), use_container_width=True)
+    caption = f"{len(x):,} punti mostrati su {len(pyramid):,}".replace(",", ".")
+    if estimated:
+        caption += (" · Serie stimata dal calendario degli eventi: pubblico durante gli eventi e copertura"
+                    " che decade nei giorni successivi. Con `data/serie.csv` si usano i dati misurati.")
+    st.caption(caption)
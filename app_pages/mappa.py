@@ -0,0 +1,238 @@
+import streamlit as st
+import base64
+
+import folium
+import pandas as pd
+from streamlit_folium import st_folium
+
+from festival.allocation import MAX_TRANSFER_MIN
+from festival.data import locations_potential, comuni_2025
+from festival.boundaries import OBJECT_NAME, level_index
+from festival.choropleth import METRICS, METHODS
+from festival.app_data import load_boundary_levels, load_event_data, choropleth_layer, layer_style, venue_route, allocation_plan, catchment_overlay
+from festival.catchment import THRESHOLDS
+
+# --- SEZIONE 2: MAPPA DEGLI EVENTI 2025 ---
+st.header("Mappa degli Eventi 2025")
+st.markdown("il festival 2025 si distribuirà su 16 comuni salentini, creando una rete culturale capillare. Inoltre, per il prossimo futuro prevediamo la flessibilità di organizzare eventi in **altre province pugliesi** su richiesta degli sponsor.")
+
+# Selezione della metrica della coropleta
+events = load_event_data()
+col_metric, col_edition, col_method = st.columns([3, 1, 1])
+with col_metric:
+    metric = st.radio("Colora i comuni per", list(METRICS), format_func=METRICS.get, horizontal=True)
+with col_edition:
+    edition = st.selectbox("Edizione", sorted(events["edizione"].unique(), reverse=True))
+with col_method:
+    method = st.selectbox("Classi", METHODS, format_func=str.capitalize)
+show_route = st.toggle("Mostra il percorso tra le sedi", help="Giro più breve tra i comuni dell'edizione per musicisti, staff e stand")
+show_plan = st.toggle(
+    "Mostra il piano ottimizzato per la prossima edizione",
+    help="Comune per ogni data del calendario che massimizza il pubblico previsto, "
+         "con le richieste degli sponsor e i tempi di viaggio tra un evento e l'altro",
+)
+show_catchment = st.toggle(
+    "Mostra i bacini d'utenza",
+    help=f"Residenti entro {', '.join(map(str, THRESHOLDS))} minuti di viaggio dalle sedi",
+)
+
+# Bacini d'utenza delle sedi, anche con località ipotetiche aggiunte
+catchment = None
+if show_catchment:
+    extra = st.multiselect("Ipotesi: aggiungi le sedi di", list(locations_potential), placeholder="Nessuna località aggiunta")
+    catchment = catchment_overlay(tuple(sorted(extra)))
+    if catchment is None:
+        st.info("Raster della popolazione non disponibile: va preparato con `python -m festival.catchment` (vedi README).")
+
+# Piano della prossima edizione, con le richieste di località degli sponsor
+plan = None
+if show_plan:
+    with st.expander("Richieste degli sponsor e vincoli di viaggio", expanded=True):
+        sponsor_requests = st.data_editor(
+            pd.DataFrame({"comune": pd.Series(dtype=str), "tipo": pd.Series(dtype=str), "eventi": pd.Series(dtype=int)}),
+            num_rows="dynamic",
+            use_container_width=True,
+            column_config={
+                "comune": st.column_config.SelectboxColumn("Comune", options=comuni_2025 + list(locations_potential), required=True),
+                "tipo": st.column_config.SelectboxColumn("Tipologia", options=["qualsiasi", "concerto", "masterclass"], default="qualsiasi"),
+                "eventi": st.column_config.NumberColumn("Eventi", min_value=1, max_value=10, step=1, default=1),
+            },
+            key="sponsor_requests",
+        )
+        max_transfer = st.slider("Massimo di guida tra due eventi (minuti)", 60, 360, MAX_TRANSFER_MIN, step=30)
+    # Richieste in forma canonica, così le stesse richieste in altro ordine usano lo stesso piano in cache
+    rows = sponsor_requests.dropna(subset=["comune", "eventi"]).itertuples()
+    requests = tuple(sorted(
+        ((row.comune, None if pd.isna(row.tipo) or row.tipo == "qualsiasi" else row.tipo, int(row.eventi)) for row in rows),
+        key=lambda r: (r[0], r[1] or "", r[2]),
+    ))
+    plan = allocation_plan(requests, max_transfer)
+
+# Creazione della mappa
+m = folium.Map(
+    location=[40.35, 18.35], 
+    zoom_start=8, 
+    tiles=None
+)
+
+# Aggiunta di tile più colorata
+folium.TileLayer(
+    tiles='https://{s}.tile.openstreetmap.fr/hot/{z}/{x}/{y}.png',
+    attr='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors, '
+         '&copy; <a href="https://cartodb.com/attributions">CartoDB</a>',
+    name='Humanitarian OpenStreetMap',
+    control=True
+).add_to(m)
+
+# Aggiunta pin blu (località potenziali)
+for city, coord in locations_potential.items():
+    folium.Marker(
+        location=coord,
+        popup=f"<b>{city}</b><br>Evento organizzabile",
+        tooltip=city,
+        icon=folium.Icon(color="blue", icon="star", prefix="fa"),
+    ).add_to(m)
+
+# Coropleta dei comuni 2025: sui confini semplificati del livello adatto allo zoom
+# corrente se disponibili, altrimenti come cerchi sulle coordinate dei comuni.
+# Il layer viaggia separato dalla mappa base, che così non viene ricostruita.
+boundary_levels = load_boundary_levels()
+map_zoom = st.session_state.get("map_zoom", 8)
+level = level_index(boundary_levels, map_zoom) if boundary_levels else None
+layer = choropleth_layer(metric, edition, method, level)
+layer_tooltip = folium.GeoJsonTooltip(fields=["nome", "valore"], labels=False)
+# Il popup di ogni comune riporta il programma dal calendario
+layer_popup = folium.GeoJsonPopup(fields=["programma"], labels=False)
+
+map_layers = folium.FeatureGroup(name=layer["label"])
+if layer["kind"] == "topology":
+    folium.TopoJson(
+        layer["data"],
+        object_path=f"objects.{OBJECT_NAME}",
+        style_function=layer_style,
+        tooltip=layer_tooltip,
+    ).add_child(layer_popup).add_to(map_layers)
+else:
+    folium.GeoJson(
+        layer["data"],
+        marker=folium.CircleMarker(radius=10),
+        style_function=layer_style,
+        tooltip=layer_tooltip,
+        popup=layer_popup,
+    ).add_to(map_layers)
+
+# Percorso ottimizzato tra le sedi, nello stesso layer dinamico
+route = venue_route(edition) if show_route else None
+if route:
+    hours, minutes = divmod(route["minuti"], 60)
+    folium.PolyLine(
+        route["coordinate"], color="#1b4f72", weight=3, opacity=0.8, dash_array="6 4",
+        tooltip=f"Percorso: {route['km']:.0f} km, circa {hours} h {minutes:02d} min di guida",
+    ).add_to(map_layers)
+
+# Fasce dei bacini d'utenza, come immagine trasparente sotto gli altri elementi
+if catchment and catchment["png"]:
+    folium.raster_layers.ImageOverlay(
+        "data:image/png;base64," + base64.b64encode(catchment["png"]).decode("ascii"),
+        bounds=catchment["limiti"], interactive=False, zindex=1,
+    ).add_to(map_layers)
+
+# Piano ottimizzato: un cerchio per comune e il giro in ordine di data
+if plan:
+    calendar = plan["calendario"]
+    folium.PolyLine(
+        calendar["coordinate"].tolist(), color="#d35400", weight=2, opacity=0.7,
+        tooltip=f"Piano: {plan['piano']['km']:.0f} km tra eventi consecutivi",
+    ).add_to(map_layers)
+    for comune, hosted in calendar.groupby("comune", sort=False):
+        dates = "<br>".join(f"{e.inizio:%d/%m} · {e.tipo.capitalize()}" for e in hosted.itertuples())
+        folium.CircleMarker(
+            hosted["coordinate"].iloc[0], radius=5 + 3 * len(hosted),
+            color="#d35400", fill=True, fill_color="#d35400", fill_opacity=0.6,
+            tooltip=f"{comune}: {len(hosted)} eventi, {hosted['pubblico_previsto'].sum()} spettatori previsti",
+            popup=folium.Popup(f"<b>{comune}</b><br>{dates}", max_width=250),
+        ).add_to(map_layers)
+
+# Visualizzazione della mappa in Streamlit
+map_state = st_folium(
+    m, use_container_width=True, height=500,
+    feature_group_to_add=map_layers,
+    returned_objects=["zoom"],
+)
+
+# Al cambio di livello di dettaglio si sostituisce solo il layer dei confini
+new_zoom = (map_state or {}).get("zoom") or map_zoom
+st.session_state["map_zoom"] = new_zoom
+if boundary_levels and level_index(boundary_levels, new_zoom) != level:
+    st.rerun()
+
+# Legenda delle classi della coropleta
+legend_items = "".join(
+    f'<span style="display:inline-block; margin-right:1rem;">'
+    f'<span style="display:inline-block; width:14px; height:14px; background:{color}; '
+    f'border:1px solid #7b241c; vertical-align:middle;"></span> '
+    f'{lo if lo == hi else f"{lo} – {hi}"}</span>'
+    for lo, hi, color in layer["legend"]
+)
+st.markdown(f"<p><b>{layer['label']} ({edition})</b>: {legend_items}</p>", unsafe_allow_html=True)
+st.markdown("""
+<ul>
+    <li><span style="color:#de2d26;">■</span> <b>Comuni colorati</b>: Comuni che ospiteranno gli eventi del 2025, più scuri al crescere della metrica scelta. </li>
+    <li><span style="color:blue;">⭐</span> <b>Pin Blu</b>: Province dove è possibile organizzare eventi in partnership.</li>
+</ul>
+""", unsafe_allow_html=True)
+
+if route:
+    st.markdown(f"**🚐 Percorso {edition}** ({route['km']:.0f} km, circa {hours} h {minutes:02d} min di guida): "
+                + " → ".join(route["tappe"]))
+
+if catchment:
+    current, proposed = catchment["attuale"], catchment["ipotesi"]
+    label = "con " + ", ".join(extra) if extra else "sedi 2025"
+    st.markdown(f"**🧭 Residenti raggiunti** ({label}; le fasce più scure sono le più vicine alle sedi)")
+    for column, minutes in zip(st.columns(len(THRESHOLDS)), THRESHOLDS):
+        reached = proposed["totale"][minutes]
+        column.metric(
+            f"Entro {minutes} minuti", f"{reached:,.0f}".replace(",", "."),
+            f"{reached - current['totale'][minutes]:+,.0f}".replace(",", ".") if extra else None,
+        )
+        column.caption(f"{proposed['piu_sedi'][minutes]:,.0f} raggiunti da più sedi".replace(",", "."))
+    with st.expander("Residenti per sede"):
+        st.dataframe(
+            pd.DataFrame([
+                {"Sede": name, **{f"Entro {t} min": round(v["raggiunti"][t]) for t in THRESHOLDS},
+                 **{f"Solo da questa sede, {t} min": round(v["esclusivi"][t]) for t in THRESHOLDS}}
+                for name, v in proposed["sedi"].items()
+            ]),
+            hide_index=True, use_container_width=True,
+        )
+
+if plan:
+    st.markdown("**🗓️ Piano ottimizzato per la prossima edizione** (cerchi arancioni, rispetto al calendario attuale)")
+    chosen, current = plan["piano"], plan["attuale"]
+    requested = sum(n for _, _, n in requests)
+    col_audience, col_requests, col_km, col_transfers = st.columns(4)
+    col_audience.metric("Pubblico previsto", f"{chosen['pubblico']:,.0f}".replace(",", "."),
+                        f"{chosen['pubblico'] - current['pubblico']:+,.0f}".replace(",", "."))
+    col_requests.metric("Richieste sponsor soddisfatte", f"{requested - chosen['richieste_mancanti']:.0f} su {requested}")
+    col_km.metric("Km tra eventi consecutivi", f"{chosen['km']:,.0f}".replace(",", "."),
+                  f"{chosen['km'] - current['km']:+,.0f}".replace(",", "."), delta_color="inverse")
+    col_transfers.metric("Trasferimenti oltre il limite", f"{chosen['trasferimenti_oltre_limite']:.0f}")
+    evaluated = f"{plan['piani_valutati']:,}".replace(",", ".")
+    rate = f"{plan['piani_al_secondo']:,.0f}".replace(",", ".")
+    # Il piano viene dalla cache: il ritmo è quello misurato quando è stato calcolato
+    st.caption(f"Al calcolo del piano: {evaluated} piani valutati, {rate} al secondo")
+    with st.expander("Calendario del piano"):
+        st.dataframe(
+            calendar[["inizio", "tipo", "comune", "pubblico_previsto"]].rename(columns={
+                "inizio": "Data", "tipo": "Tipologia", "comune": "Comune", "pubblico_previsto": "Pubblico previsto",
+            }),
+            hide_index=True, use_container_width=True,
+            column_config={"Data": st.column_config.DatetimeColumn(format="DD/MM HH:mm")},
+        )
+
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown("**🔴 Eventi Confermati 2025**: " + ", ".join(comuni_2025))
+with col2:
+    st.markdown("**🔵 Eventi Possibili**: Si possono organizzare eventi anche a " + ", ".join(locations_potential.keys()))
@@ -0,0 +1,59 @@
+import streamlit as st
+
+from festival.app_data import load_event_data, share_card
+from festival.data import compute_kpis
+from festival.share_cards import RATIO_LABELS, RATIOS, edition_events
+
+# --- SEZIONE 5: AZIONI PROMOZIONALI ---
+st.header("Azioni Promozionali Attive")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.markdown("""
+    ### 🎯 Campagna Instagram ADS
+    - Geolocalizzata per ogni evento
+    - Target mirato sul pubblico interessato
+    - Ottimizzazione continua delle performance
+    """)
+
+with col2:
+    st.markdown("""
+    ### 🎁 Codici Sconto Interattivi
+    - Rilasciati dopo interazione diretta
+    - Incentivano follow e condivisioni
+    - Trackable per ROI measurement
+    """)
+
+# --- CARD PER I SOCIAL ---
+st.header("Card per i Social")
+st.markdown("I KPI del festival pronti da pubblicare, nei formati dei feed, delle storie e delle anteprime dei link.")
+
+events = edition_events(load_event_data(), compute_kpis()["anno"])
+col_card, col_options = st.columns([2, 1])
+
+with col_options:
+    ratio = st.radio("Formato", list(RATIOS), format_func=lambda r: RATIO_LABELS[r])
+    event = st.selectbox(
+        "Evento",
+        [None, *range(len(events))],
+        format_func=lambda i: "Tutto il festival" if i is None else
+        f"{events.at[i, 'inizio']:%d/%m} · {events.at[i, 'comune']} · {events.at[i, 'tipo'].capitalize()}",
+    )
+    png = share_card(ratio, event)
+    name = "festival" if event is None else f"evento-{event + 1:02d}-{events.at[event, 'comune']}"
+    st.download_button(
+        "⬇️ Scarica la card",
+        png,
+        file_name=f"{name}-{ratio.replace(':', '-')}.png".lower().replace(" ", "-"),
+        mime="image/png",
+    )
+    st.caption("Tutte le card, anche per ogni evento: `python -m festival.share_cards`")
+
+with col_card:
+    width, height = RATIOS[ratio]
+    # Le card verticali a tutta colonna sarebbero più alte dello schermo
+    if width > height:
+        st.image(png, use_container_width=True)
+    else:
+        st.image(png, width=420)
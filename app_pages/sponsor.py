@@ -0,0 +1,157 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+from festival.app_data import logo_wall, sponsor_simulation
+from festival.data import sponsorship_packages
+from festival.sponsor_roi import DEFAULT_SCENARIO, DEFAULT_TRIALS
+
+
+def format_euro(value):
+    # Prezzi con il separatore delle migliaia italiano: 1.500 €
+    return f"{value:,} €".replace(",", ".")
+
+
+# --- SEZIONE 3: SPONSOR E PARTNER ---
+st.header("Sponsor e Partner")
+st.markdown("Il festival è reso possibile grazie al supporto di partner istituzionali e locali.")
+
+# Loghi dal registro degli sponsor, un atlante per livello
+wall, missing = logo_wall()
+st.markdown(wall, unsafe_allow_html=True)
+if missing:
+    st.warning("Logo mancante per: " + ", ".join(missing))
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.markdown("""
+    <div class="sponsor-card">
+        <h4>🏘️ Comuni del Salento</h4>
+        <p>16 Amministrazioni</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+with col2:
+    st.markdown("""
+    <div class="sponsor-card">
+        <h4>🤝 Partner Commerciali</h4>
+        <p>Opportunità Aperte</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+st.markdown("#### I 16 Comuni aderenti:")
+st.caption("Alessano, Andrano, Castrignano del Capo, Corsano, Diso, Gagliano del Capo, Lecce, Matino, Morciano di Leuca, Presicce-Acquarica, Salve, Specchia, Taurisano, Taviano, Tricase, Ugento")
+
+st.markdown("---")
+
+# --- SEZIONE 4: OPPORTUNITÀ DI SPONSORIZZAZIONE ---
+st.header("Opportunità di Sponsorizzazione")
+st.markdown("Associa il tuo brand a un evento culturale di prestigio, con un pubblico in presenza stimato di **3.800 persone** e una visibilità online di milioni di utenti.")
+
+with st.container():
+    st.subheader("Pacchetti di Sponsorizzazione")
+
+    # Tabella HTML per styling personalizzato, generata dai pacchetti in festival/data.py
+    # (gli stessi prezzi serviti dall'API)
+    per_type = [p for p in sponsorship_packages if p["tipologia"] != "Combinato"]
+    combined = [p for p in sponsorship_packages if p["tipologia"] == "Combinato"]
+    types = list(dict.fromkeys(p["tipologia"] for p in per_type))
+    sizes = list(dict.fromkeys(p["pacchetto"] for p in per_type))
+
+    def combined_header(p):
+        if p.get("esclusive"):
+            return f'🌟 {p["pacchetto"]}<br><small style="font-weight:normal;">(Tutti gli eventi + esclusive)</small>'
+        return f'{p["pacchetto"]}<br><small>({p["concerti"]} Concerti + {p["masterclass"]} Masterclass)</small>'
+
+    header = "".join(f"<th>{size}</th>" for size in sizes) + "".join(f"<th>{combined_header(p)}</th>" for p in combined)
+    body = ""
+    for i, kind in enumerate(types):
+        prices = {p["pacchetto"]: p["prezzo"] for p in per_type if p["tipologia"] == kind}
+        cells = "".join(f"<td>{format_euro(prices[size])}</td>" for size in sizes)
+        if i == 0:
+            cells += "".join(
+                f'<td rowspan="{len(types)}" style="text-align:center; vertical-align:middle; '
+                f'background-color:var(--bg-secondary);"><b>{format_euro(p["prezzo"])}</b></td>'
+                for p in combined
+            )
+        body += f"<tr><td><b>{kind}</b></td>{cells}</tr>"
+
+    sponsorship_html = f"""
+    <table class="styled-table">
+        <thead><tr><th>Tipologia di Evento</th>{header}</tr></thead>
+        <tbody>{body}</tbody>
+    </table>
+    """
+    st.markdown(sponsorship_html, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    st.subheader("🌟 Esclusive per MAIN SPONSOR")
+    st.markdown("""
+    Un pacchetto completo per la massima visibilità, che include tutti i 34 eventi (24 concerti e 10 masterclass) e i seguenti benefici:
+
+    - 🏪 **Stand fisico personalizzato** in tutti i 16 comuni
+    - 🎬 Presenza nel **teaser video ufficiale** proiettato prima di ogni concerto
+    - 📺 **Spot video dedicato** (30–60 secondi) all'inizio di ogni evento
+    - 📱 **Campagna social dedicata** con contenuti e link diretto allo sponsor
+    - 🎨 **Logo su tutto il materiale ufficiale** (social, stampa, locandine, video)
+    - 🎤 **Menzione ufficiale pubblica** in apertura e chiusura degli eventi
+    - 📰 **Priorità su tutte le uscite stampa** e i contenuti online
+    - 📅 Organizzazione di eventi della campagna 2026 in **località di interesse dello sponsor**
+    - 📸 **Cornice con logo sponsor** per foto durante gli eventi
+    """)
+
+    # Simulatore di visibilità: quanto rende ciascun pacchetto, con l'incertezza delle previsioni
+    st.subheader("📊 Quanta visibilità per ogni pacchetto?")
+    st.markdown(
+        f"Stime da {DEFAULT_TRIALS:,} simulazioni per pacchetto".replace(",", ".")
+        + ", estraendo pubblico e copertura di ogni evento dalle distribuzioni dei dati storici."
+    )
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        audience_growth = st.slider("Crescita pubblico (%)", -30, 50, int(DEFAULT_SCENARIO["crescita_pubblico"]), 5)
+    with col2:
+        reach_growth = st.slider("Crescita copertura (%)", -30, 50, int(DEFAULT_SCENARIO["crescita_copertura"]), 5)
+    with col3:
+        presence_rate = st.slider("Riscatto coupon in presenza (%)", 0.5, 10.0,
+                                  DEFAULT_SCENARIO["riscatto_presenza"] * 100, 0.5)
+    with col4:
+        online_rate = st.slider("Riscatto codici online (‰)", 0.05, 2.0,
+                                DEFAULT_SCENARIO["riscatto_online"] * 1000, 0.05)
+    # Valori normalizzati come nello scenario di riferimento, già calcolato dal riscaldamento delle cache
+    summary, distributions = sponsor_simulation(
+        float(audience_growth), float(reach_growth), round(presence_rate / 100, 6), round(online_rate / 1000, 7),
+    )
+    labels = list(dict.fromkeys(summary["pacchetto"]))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        # Distribuzione delle impressioni, su scala logaritmica comune a tutti i pacchetti
+        centers, frequencies = distributions["impressioni"]
+        fig_impressions = go.Figure([
+            go.Scatter(x=centers, y=frequencies[label], name=label, mode="lines", fill="tozeroy", opacity=0.6)
+            for label in labels
+        ])
+        fig_impressions.update_layout(title="Impressioni totali", xaxis_type="log", yaxis_title="Probabilità",
+                                      height=420, legend=dict(font=dict(size=10)))
+        st.plotly_chart(fig_impressions, use_container_width=True)
+    with col2:
+        # Costo per mille impressioni: scatola tra 25° e 75° percentile, baffi tra 5° e 95°
+        cpm = summary[summary["metrica"] == "cpm"].set_index("pacchetto").loc[labels]
+        fig_cpm = go.Figure(go.Box(
+            x=labels, q1=cpm["p25"], median=cpm["p50"], q3=cpm["p75"],
+            lowerfence=cpm["p5"], upperfence=cpm["p95"], mean=cpm["media"],
+            marker_color="#9e1b32", name="CPM",
+        ))
+        fig_cpm.update_layout(title="Costo per mille impressioni (€)", height=420, showlegend=False)
+        st.plotly_chart(fig_cpm, use_container_width=True)
+
+    table = summary.pivot(index="pacchetto", columns="metrica", values="p50").loc[labels]
+    st.dataframe(
+        table[["impressioni", "cpm", "riscatti"]].rename(columns={
+            "impressioni": "Impressioni (mediana)", "cpm": "CPM € (mediana)", "riscatti": "Riscatti attesi (mediana)",
+        }).style.format(lambda v: f"{v:,.0f}".replace(",", "."))
+        .format(lambda v: f"{v:.2f}".replace(".", ","), subset=["CPM € (mediana)"]),
+        use_container_width=True,
+    )
+    st.caption("Il MAIN SPONSOR vale più impressioni per spettatore (stand, spot e menzioni) e una campagna social dedicata.")
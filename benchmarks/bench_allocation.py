@@ -0,0 +1,55 @@
+"""Ottimizzatore del piano: piani valutati al secondo e qualità al variare del budget.
+
+Uso::
+
+    python benchmarks/bench_allocation.py [--seeds 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival.allocation import CHAINS, STEPS, Problem, optimize  # noqa: E402
+from festival.data import load_events  # noqa: E402
+
+# Esempio di richieste: due concerti a Bari e un evento qualsiasi a Taranto
+REQUESTS = (("Bari", "concerto", 2), ("Taranto", None, 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    events = load_events()
+    problem = Problem(events, REQUESTS)
+    rng = np.random.default_rng(0)
+    for batch in (1, 64, 1024):
+        plans = rng.integers(len(problem.comuni), size=(batch, len(problem.slots)))
+        repeat = max(20_000 // batch, 5)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            problem.score(plans)
+        elapsed = time.perf_counter() - start
+        print(f"punteggio di {batch:>5} piani per chiamata: {batch * repeat / elapsed:>12,.0f} piani/s")
+
+    print()
+    for steps in (STEPS // 4, STEPS, STEPS * 4):
+        scores, seconds = [], []
+        for seed in range(args.seeds):
+            start = time.perf_counter()
+            result = optimize(events, REQUESTS, chains=CHAINS, steps=steps, seed=seed)
+            seconds.append(time.perf_counter() - start)
+            scores.append(result["piano"]["punteggio"])
+        print(f"{CHAINS} catene x {steps:>5} passi: punteggio {np.mean(scores):7.1f} (min {min(scores):.1f},"
+              f" max {max(scores):.1f}) in {np.mean(seconds):.2f} s, {result['piani_al_secondo']:,.0f} piani/s")
+    print(f"calendario attuale: punteggio {result['attuale']['punteggio']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
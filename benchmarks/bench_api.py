@@ -0,0 +1,94 @@
+"""Richieste al secondo servite dall'API da un singolo processo.
+
+Avvia ``python -m festival.api`` e lo interroga con più client in processi
+separati, su connessioni keep-alive, alternando richieste complete (gzip) e
+rivalidazioni con ``If-None-Match``.
+
+Uso::
+
+    python benchmarks/bench_api.py [--clients 4] [--seconds 5]
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ["/api/v1/storico", "/api/v1/kpi", "/api/v1/luoghi", "/api/v1/prezzi"]
+
+
+def client(port, seconds, results):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    etags = {}
+    counts = {200: 0, 304: 0}
+    deadline = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < deadline:
+        path = ENDPOINTS[i % len(ENDPOINTS)]
+        headers = {"Accept-Encoding": "gzip"}
+        # Una richiesta su due rivalida la copia già ricevuta
+        if i % 2 and path in etags:
+            headers["If-None-Match"] = etags[path]
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        etags[path] = response.getheader("ETag")
+        counts[response.status] += 1
+        i += 1
+    results.put(counts)
+
+
+def wait_for(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/v1")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("L'API non risponde")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--port", type=int, default=8599)
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "festival.api", "--host", "127.0.0.1", "--port", str(args.port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(args.port)
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=client, args=(args.port, args.seconds, results))
+            for _ in range(args.clients)
+        ]
+        for w in workers:
+            w.start()
+        totals = {200: 0, 304: 0}
+        for _ in workers:
+            for status, n in results.get().items():
+                totals[status] += n
+        for w in workers:
+            w.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    total = sum(totals.values())
+    print(f"{total} richieste in {args.seconds:.0f} s con {args.clients} client: "
+          f"{total / args.seconds:,.0f} req/s ({totals[200]} x 200, {totals[304]} x 304)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Bacini d'utenza: impronte delle sedi, insieme delle sedi 2025 e ipotesi "aggiungi Bari".
+
+Usa il raster preparato in ``data/``; senza, una griglia sintetica della
+stessa estensione e risoluzione (3 secondi d'arco) in una cartella temporanea.
+Alla fine confronta i residenti di "aggiungi Bari" con un calcolo a forza
+bruta, con la distanza da ogni sede per ogni cella del riquadro; se non
+coincidono esce con codice 1.
+
+Uso::
+
+    python benchmarks/bench_catchment.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival import catchment  # noqa: E402
+from festival.routing import haversine_km, travel_minutes  # noqa: E402
+
+
+def synthetic_grid(directory):
+    step = 1 / 1200
+    rows, cols = int(2.6 / step), int(3.7 / step)
+    raster = os.path.join(directory, "popolazione.npy")
+    grid = np.lib.format.open_memmap(raster, mode="w+", dtype=np.float32, shape=(rows, cols))
+    grid[:] = np.random.default_rng(0).gamma(0.5, 3, (rows, cols))
+    grid.flush()
+    meta = os.path.join(directory, "popolazione.json")
+    with open(meta, "w", encoding="utf-8") as f:
+        f.write(f'{{"nord": 42.3, "ovest": 14.9, "passo_lat": {step}, "passo_lon": {step}, '
+                f'"righe": {rows}, "colonne": {cols}}}')
+    return catchment.PopulationGrid(raster, meta)
+
+
+def brute_force(grid, venues):
+    """Residenti per soglia in totale, da più sedi e per sede, cella per cella e sede per sede."""
+    m = grid.meta
+    # Riquadro delle sedi con un margine oltre l'ultima soglia: fuori nessuna cella è raggiungibile
+    coords = np.array(list(venues.values()), dtype=float)
+    margin = 1.5 * catchment.reach_km(max(grid.thresholds)) / 111.0
+    dlon = margin / np.cos(np.radians(coords[:, 0].max() + margin))
+    r0 = max(int((m["nord"] - coords[:, 0].max() - margin) / m["passo_lat"]), 0)
+    r1 = min(int((m["nord"] - coords[:, 0].min() + margin) / m["passo_lat"]) + 1, m["righe"])
+    c0 = max(int((coords[:, 1].min() - dlon - m["ovest"]) / m["passo_lon"]), 0)
+    c1 = min(int((coords[:, 1].max() + dlon - m["ovest"]) / m["passo_lon"]) + 1, m["colonne"])
+    lat = (m["nord"] - (np.arange(r0, r1) + 0.5) * m["passo_lat"])[:, None]
+    lon = (m["ovest"] + (np.arange(c0, c1) + 0.5) * m["passo_lon"])[None, :]
+    population = np.asarray(grid.population[r0:r1, c0:c1], dtype=np.float64)
+
+    minutes = {name: travel_minutes(haversine_km(vlat, vlon, lat, lon)) for name, (vlat, vlon) in venues.items()}
+    result = {"totale": {}, "piu_sedi": {}, "sedi": {name: {"raggiunti": {}, "esclusivi": {}} for name in venues}}
+    for t in grid.thresholds:
+        count = sum((mins <= t).astype(np.int32) for mins in minutes.values())
+        result["totale"][t] = population[count >= 1].sum()
+        result["piu_sedi"][t] = population[count >= 2].sum()
+        for name, mins in minutes.items():
+            result["sedi"][name]["raggiunti"][t] = population[mins <= t].sum()
+            result["sedi"][name]["esclusivi"][t] = population[(mins <= t) & (count == 1)].sum()
+    return result
+
+
+def check_against_brute_force(grid, venues):
+    expected = brute_force(grid, venues)
+    result = grid.catchment(venues)
+    pairs = [(f"totale {t}", result["totale"][t], expected["totale"][t]) for t in grid.thresholds]
+    pairs += [(f"più sedi {t}", result["piu_sedi"][t], expected["piu_sedi"][t]) for t in grid.thresholds]
+    pairs += [
+        (f"{name} {kind} {t}", result["sedi"].get(name, {}).get(kind, {}).get(t, 0.0), values[t])
+        for name, venue in expected["sedi"].items() for kind, values in venue.items() for t in grid.thresholds
+    ]
+    wrong = [label for label, got, want in pairs if not np.isclose(got, want, rtol=1e-6, atol=1e-3)]
+    if wrong:
+        sys.exit("Bacini diversi dal calcolo a forza bruta: " + ", ".join(wrong[:5]))
+    print(f"Bacini identici al calcolo a forza bruta ({len(pairs)} valori)")
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        grid = catchment.PopulationGrid.load()
+        if grid is None:
+            print("Raster non preparato: griglia sintetica")
+            grid = synthetic_grid(directory)
+        print(f"{grid.meta['righe']} x {grid.meta['colonne']} celle in memory-mapping")
+
+        base, with_bari = catchment.venue_sets(["Bari"])
+        _, everything = catchment.venue_sets(["Bari", "Taranto", "Barletta (BAT)"])
+        for label, venues in (
+            ("sedi 2025, a freddo", base),
+            ("sedi 2025, in cache", base),
+            ("aggiungi Bari", with_bari),
+            ("aggiungi tutte le potenziali", everything),
+        ):
+            result, ms = timed(lambda: grid.catchment(venues))
+            reached = "  ".join(f"{t} min {result['totale'][t]:>12,.0f}" for t in result["soglie"])
+            print(f"{label:<30}{ms:>8.1f} ms  {reached}")
+        (png, _), ms = timed(lambda: grid.overlay(result))
+        print(f"{'immagine per la mappa':<30}{ms:>8.1f} ms  {len(png) / 1024:.0f} KB")
+        check_against_brute_force(grid, with_bari)
+
+
+if __name__ == "__main__":
+    main()
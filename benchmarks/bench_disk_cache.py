@@ -0,0 +1,93 @@
+"""Hit rate e latenza della cache su disco con più processi worker.
+
+Ogni worker richiede artefatti da un insieme di chiavi con popolarità Zipf;
+un artefatto mancante costa un calcolo sintetico di qualche decina di
+millisecondi. Con la cache condivisa ogni artefatto viene calcolato una sola
+volta per tutti i worker.
+
+Uso::
+
+    python benchmarks/bench_disk_cache.py [--workers 4] [--requests 500] [--keys 200]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival.disk_cache import DiskCache  # noqa: E402
+
+
+def artifact(key, size_kb, compute_ms):
+    # Calcolo sintetico: occupa la CPU per compute_ms e produce size_kb di dati
+    deadline = time.perf_counter() + compute_ms / 1000
+    rng = np.random.default_rng(key)
+    while time.perf_counter() < deadline:
+        rng.random(1000)
+    return rng.bytes(size_kb * 1024)
+
+
+def worker(args):
+    path, max_bytes, seed, n_requests, n_keys, size_kb, compute_ms = args
+    cache = DiskCache(path, max_bytes)
+    rng = np.random.default_rng(seed)
+    keys = np.minimum(rng.zipf(1.2, n_requests), n_keys) - 1
+    computed = 0
+    latencies = []
+    for key in keys:
+        start = time.perf_counter()
+
+        def compute():
+            nonlocal computed
+            computed += 1
+            return artifact(int(key), size_kb, compute_ms)
+
+        cache.get_or_compute(f"artefatto-{key}", compute)
+        latencies.append(time.perf_counter() - start)
+    return computed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=500, help="richieste per worker")
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=200)
+    parser.add_argument("--compute-ms", type=float, default=30)
+    parser.add_argument("--max-mb", type=float, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sqlite")
+        max_bytes = int(args.max_mb * 1024 * 1024)
+        DiskCache(path, max_bytes)
+        jobs = [
+            (path, max_bytes, seed, args.requests, args.keys, args.size_kb, args.compute_ms)
+            for seed in range(args.workers)
+        ]
+        start = time.perf_counter()
+        with multiprocessing.Pool(args.workers) as pool:
+            results = pool.map(worker, jobs)
+        elapsed = time.perf_counter() - start
+        info = DiskCache(path, max_bytes).info()
+
+    computed = sum(c for c, _ in results)
+    latencies = np.concatenate([lat for _, lat in results]) * 1000
+    total = len(latencies)
+    print(f"{args.workers} worker x {args.requests} richieste su {args.keys} chiavi, "
+          f"artefatti da {args.size_kb} KB ({args.compute_ms:.0f} ms di calcolo)")
+    print(f"calcoli: {computed}   hit rate: {1 - computed / total:.1%}   tempo totale: {elapsed:.2f} s")
+    print(f"latenza ms  p50 {np.percentile(latencies, 50):.2f}   p90 {np.percentile(latencies, 90):.2f}   "
+          f"p99 {np.percentile(latencies, 99):.2f}")
+    print(f"in cache: {info['artefatti']} artefatti, {info['byte'] / 1024 / 1024:.1f} MB "
+          f"(massimo {args.max_mb:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Muro dei loghi: atlanti a freddo, ricostruzione incrementale e peso della pagina.
+
+Genera ``--sponsors`` loghi sintetici a piena risoluzione in una cartella
+temporanea, distribuiti sui livelli, e misura la costruzione degli atlanti.
+
+Uso::
+
+    python benchmarks/bench_logo_wall.py [--sponsors 300]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival import logo_wall  # noqa: E402
+
+
+def synthetic_logo(path, rng):
+    # Logo su fondo bianco con forme e bordi da ritagliare, come un file fornito da uno sponsor
+    width, height = int(rng.integers(400, 1600)), int(rng.integers(200, 900))
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for _ in range(4):
+        x0, y0 = rng.integers(width // 8, width // 2), rng.integers(height // 8, height // 2)
+        x1, y1 = x0 + rng.integers(20, width // 2), y0 + rng.integers(20, height // 2)
+        draw.ellipse((x0, y0, x1, y1), fill=tuple(int(c) for c in rng.integers(0, 200, 3)))
+    image.save(path)
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    manifest = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<28}{elapsed:>9.0f} ms  {manifest['celle_nuove']:>4} celle, {manifest['atlanti_nuovi']} atlanti rigenerati")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sponsors", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["FESTIVAL_CACHE_DIR"] = os.path.join(directory, "cache")
+        atlas_dir = os.path.join(directory, "atlanti")
+        tiers = list(logo_wall.TIERS)
+        rows = []
+        for i in range(args.sponsors):
+            path = os.path.join(directory, f"logo-{i:04d}.png")
+            synthetic_logo(path, rng)
+            # Pochi main sponsor, più partner, molti sostenitori
+            tier = tiers[0] if i < 8 else tiers[1] if i < args.sponsors // 3 else tiers[2]
+            rows.append({"nome": f"Sponsor {i}", "livello": tier, "logo": path, "sito": ""})
+        registry = pd.DataFrame(rows)
+        originals = sum(os.path.getsize(r["logo"]) for r in rows)
+
+        manifest = timed("a freddo", lambda: logo_wall.build(registry, atlas_dir))
+        timed("nessuna modifica", lambda: logo_wall.build(registry, atlas_dir))
+        synthetic_logo(rows[-1]["logo"], rng)
+        timed("un sostenitore cambiato", lambda: logo_wall.build(registry, atlas_dir))
+        path = os.path.join(directory, "logo-nuovo.png")
+        synthetic_logo(path, rng)
+        registry = pd.concat([registry, pd.DataFrame([{"nome": "Nuovo", "livello": tiers[1], "logo": path, "sito": ""}])])
+        manifest = timed("un partner aggiunto", lambda: logo_wall.build(registry, atlas_dir))
+
+        atlases = {tier: os.path.getsize(os.path.join(atlas_dir, level["atlante"]))
+                   for tier, level in manifest["livelli"].items()}
+        print(f"\n{len(registry)} loghi originali: {originals / 1e6:.1f} MB in {len(registry)} richieste")
+        print("atlanti: " + ", ".join(f"{tier} {size / 1024:.0f} KB" for tier, size in atlases.items())
+              + f" ({len(atlases)} richieste, {sum(atlases.values()) / 1024:.0f} KB)")
+        print(f"HTML del muro: {len(logo_wall.wall_html(manifest)) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Tempi di rendering a freddo e a caldo di ciascuna pagina dell'app.
+
+Il freddo si misura in un processo nuovo (import e cache vuote inclusi), il
+caldo come mediana delle esecuzioni successive nello stesso processo.
+
+Uso::
+
+    python benchmarks/bench_pages.py [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = {
+    "impatto": "app_pages/impatto.py",
+    "mappa": "app_pages/mappa.py",
+    "calendario": "app_pages/calendario.py",
+    "sponsor": "app_pages/sponsor.py",
+    "promozioni": "app_pages/promozioni.py",
+}
+
+
+def measure(page, runs):
+    """Eseguito nel processo figlio: restituisce i tempi di una pagina in secondi."""
+    from streamlit.testing.v1 import AppTest
+
+    # AppTest non esegue le pagine di st.navigation: si esegue lo script della pagina
+    at = AppTest.from_file(os.path.join(ROOT, PAGES[page]), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    warm = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        warm.append(time.perf_counter() - start)
+    return {"cold": cold, "warm": statistics.median(warm)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--page", choices=PAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.page:
+        print(json.dumps(measure(args.page, args.runs)))
+        return
+
+    print(f"{'pagina':<12}{'freddo (ms)':>14}{'caldo (ms)':>14}")
+    for page in PAGES:
+        out = subprocess.run(
+            [sys.executable, __file__, "--page", page, "--runs", str(args.runs)],
+            cwd=ROOT, env={**os.environ, "PYTHONPATH": ROOT},
+            capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{page:<12}{result['cold'] * 1000:>14.1f}{result['warm'] * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
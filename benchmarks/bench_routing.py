@@ -0,0 +1,42 @@
+"""Tempo di calcolo del percorso tra centinaia di sedi sintetiche in Puglia.
+
+Uso::
+
+    python benchmarks/bench_routing.py [--venues 100 200 400]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival.routing import _nearest_neighbour, distance_matrix, route_length, solve_order  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--venues", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'sedi':>6}{'matrice ms':>12}{'percorso ms':>13}{'vicino km':>11}{'ottimizzato km':>16}")
+    for n in args.venues:
+        # Sedi sparse sul rettangolo tra Barletta e Leuca
+        coords = np.column_stack([rng.uniform(39.8, 41.3, n), rng.uniform(16.2, 18.5, n)])
+        start = time.perf_counter()
+        dist = distance_matrix(coords)
+        matrix_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        order = solve_order(dist)
+        solve_ms = (time.perf_counter() - start) * 1000
+        greedy = route_length(dist, _nearest_neighbour(dist, 0))
+        print(f"{n:>6}{matrix_ms:>12.1f}{solve_ms:>13.1f}{greedy:>11.0f}{route_length(dist, order):>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
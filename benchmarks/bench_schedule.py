@@ -0,0 +1,76 @@
+"""Latenza delle query del calendario su un archivio multi-edizione sintetico.
+
+Uso::
+
+    python benchmarks/bench_schedule.py [--editions 20] [--events 500]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival.data import locations_2025, locations_potential  # noqa: E402
+from festival.schedule import Schedule  # noqa: E402
+
+
+def synthetic_archive(editions, per_edition, seed=0):
+    """Eventi distribuiti tra luglio e settembre di ogni edizione, nei comuni noti."""
+    rng = np.random.default_rng(seed)
+    comuni = list({**locations_2025, **locations_potential})
+    frames = []
+    for year in range(2025 - editions + 1, 2026):
+        start = pd.Timestamp(f"{year}-07-01") + pd.to_timedelta(rng.integers(0, 90 * 24, per_edition), unit="h")
+        frames.append(pd.DataFrame({
+            "edizione": year,
+            "inizio": start,
+            "fine": start + pd.to_timedelta(rng.integers(1, 4, per_edition), unit="h"),
+            "comune": rng.choice(comuni, per_edition),
+            "sede": rng.choice(["Piazza principale", "Sala comunale", "Chiesa madre"], per_edition),
+            "tipo": rng.choice(["concerto", "masterclass"], per_edition),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--editions", type=int, default=20)
+    parser.add_argument("--events", type=int, default=500, help="eventi per edizione")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    events = synthetic_archive(args.editions, args.events)
+    start = time.perf_counter()
+    schedule = Schedule(events)
+    print(f"{len(schedule)} eventi, indice costruito in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    lat, lon = locations_2025["Tricase"]
+    now = pd.Timestamp("2025-08-10 12:00")
+    t0, t1 = np.datetime64("2025-08-10", "s").astype(np.int64), np.datetime64("2025-08-11", "s").astype(np.int64)
+    queries = {
+        "indice: eventi in un giorno": lambda: schedule._overlapping(t0, t1),
+        "eventi di oggi (DataFrame)": lambda: schedule.on_day("2025-08-10"),
+        "prossimi 5 entro 20 km": lambda: schedule.upcoming_near(lat, lon, now, 20, 5),
+        "conflitti di sede": schedule.conflicts,
+    }
+    for name, fn in queries.items():
+        print(f"{name:<30}{timed(fn, args.repeat):>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
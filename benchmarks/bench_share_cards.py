@@ -0,0 +1,48 @@
+"""Card per i social: rendering a freddo, in parallelo e dalla cache su disco.
+
+Uso::
+
+    python benchmarks/bench_share_cards.py [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival import share_cards  # noqa: E402
+from festival.data import compute_kpis, df_historical, load_events  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    events = load_events()
+    content = share_cards.card_content(compute_kpis(df_historical, events), events)
+    # Il primo rendering di ogni formato legge i loghi e crea i font
+    for ratio in share_cards.RATIOS:
+        share_cards.render_card(content, ratio)
+    for ratio in share_cards.RATIOS:
+        start = time.perf_counter()
+        png = share_cards.render_card(content, ratio)
+        print(f"{ratio:<8}{(time.perf_counter() - start) * 1000:>8.0f} ms {len(png) / 1024:>6.0f} KB")
+
+    with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as out:
+        # Cache vuota: ogni card si compone; al secondo giro si leggono tutte dal disco
+        os.environ["FESTIVAL_CACHE_DIR"] = cache_dir
+        share_cards.disk_cache.default_cache.cache_clear()
+        for label in ("a freddo", "dalla cache"):
+            start = time.perf_counter()
+            paths = share_cards.render_batch(out, workers=args.workers, events=events)
+            elapsed = time.perf_counter() - start
+            print(f"{len(paths)} card {label} con {args.workers} processi: {elapsed:.2f} s"
+                  f" ({elapsed / len(paths) * 1000:.1f} ms per card)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Tempo del simulatore Monte Carlo dei pacchetti di sponsorizzazione.
+
+Uso::
+
+    python benchmarks/bench_sponsor_roi.py [--trials 100000 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival.data import sponsorship_packages  # noqa: E402
+from festival.sponsor_roi import fit_distributions, simulate, summarize  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    fit = fit_distributions()
+    for trials in args.trials:
+        start = time.perf_counter()
+        results = simulate(trials=trials, fit=fit)
+        simulated = time.perf_counter() - start
+        summarize(results)
+        total = time.perf_counter() - start
+        print(f"{trials:>10,} prove x {len(sponsorship_packages)} pacchetti: "
+              f"simulazione {simulated * 1000:.0f} ms, con percentili {total * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Riduzione delle serie orarie: tempi della piramide e peso del grafico inviato al browser.
+
+Prima dei tempi controlla che ``lttb`` scelga gli stessi punti
+dell'algoritmo originale di Steinarsson, scritto qui in Python semplice;
+se non coincidono esce con codice 1.
+
+Uso::
+
+    python benchmarks/bench_timeseries.py [--points 500000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival.timeseries import DEFAULT_POINTS, Pyramid, figure, lttb, minmax  # noqa: E402
+
+
+def timed(fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def reference_lttb(x, y, n_out):
+    """LTTB come nella tesi di Steinarsson (2013), un punto alla volta."""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    keep = [0]
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+    return keep + [n - 1]
+
+
+def check_lttb(x, y):
+    """Indici scelti da ``lttb`` e dal riferimento su alcune serie e misure di uscita."""
+    index = {value: i for i, value in enumerate(x.astype(np.int64).tolist())}
+    seconds = x.astype(np.int64).astype(float).tolist()
+    values = y.astype(float).tolist()
+    for n, n_out in ((1000, 3), (1000, 100), (20_000, 1000), (20_001, 2000), (50_000, 4999)):
+        if n > len(x):
+            continue
+        chosen = [index[v] for v in lttb(x[:n], y[:n], n_out)[0].astype(np.int64).tolist()]
+        if chosen != reference_lttb(seconds[:n], values[:n], n_out):
+            sys.exit(f"LTTB diverso dal riferimento: {n} punti ridotti a {n_out}")
+    print("LTTB identico al riferimento punto per punto")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=500_000)
+    args = parser.parse_args()
+
+    # Serie oraria sintetica: ciclo giornaliero, picchi casuali e rumore
+    rng = np.random.default_rng(0)
+    x = np.datetime64("2005-07-01T00", "h") + np.arange(args.points)
+    hours = np.arange(args.points)
+    y = 1000 + 400 * np.sin(hours * 2 * np.pi / 24) + rng.gamma(1.5, 200, args.points)
+    x = x.astype("datetime64[s]")
+    check_lttb(x, y)
+
+    pyramid, build_ms = timed(lambda: Pyramid(x, y), repeat=3)
+    print(f"{args.points:,} punti, piramide di {len(pyramid.levels)} livelli costruita in {build_ms:.0f} ms")
+
+    window = (x[len(x) // 3], x[len(x) // 3 + 24 * 30])
+    for name, fn in {
+        "query serie intera": lambda: pyramid.query(max_points=DEFAULT_POINTS),
+        "query finestra di 30 giorni": lambda: pyramid.query(*window, max_points=DEFAULT_POINTS),
+        "min-max diretto": lambda: minmax(x, y, DEFAULT_POINTS // 2),
+        "LTTB diretto": lambda: lttb(x, y, DEFAULT_POINTS),
+    }.items():
+        (px, _), ms = timed(fn)
+        print(f"{name:<30}{ms:>9.2f} ms {len(px):>8,} punti")
+
+    raw = len(figure(x, y, "serie").to_json())
+    reduced = len(figure(*pyramid.query(max_points=DEFAULT_POINTS), "serie").to_json())
+    print(f"JSON del grafico: {raw / 1e6:.1f} MB grezzo, {reduced / 1e3:.0f} KB ridotto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Moduli di supporto all'infografica del Festival del Capo di Leuca."""
@@ -0,0 +1,248 @@
+"""Assegnazione degli eventi della prossima edizione ai comuni.
+
+Il calendario (date e tipologia dei concerti e delle masterclass) è quello
+dell'ultima edizione; per ogni data si sceglie il comune che ospita
+l'evento. Il piano massimizza il pubblico previsto, con rendimenti
+decrescenti per gli eventi ripetuti nello stesso comune e il limite della
+capienza delle sedi, soddisfa le richieste di località degli sponsor (le
+province fuori dal Salento entrano nel piano solo se richieste; ogni evento
+vale per una sola richiesta, anche se più richieste per lo stesso comune si
+sovrappongono) e rispetta i
+vincoli di viaggio: il trasferimento tra due eventi consecutivi deve stare
+nel tempo tra i due, meno l'allestimento, e nel massimo per trasferimento.
+
+La ricerca è una tempra simulata con molte catene in parallelo: a ogni passo
+ogni catena propone una mossa (un evento spostato in un altro comune o due
+eventi scambiati) e tutte le proposte si valutano insieme con operazioni
+vettoriali NumPy. Il piano migliore si rifinisce valutando in un colpo ogni
+spostamento e ogni scambio possibile, finché uno migliora il punteggio.
+
+Il pubblico atteso per comune e tipologia è la media storica, avvicinata alla
+media della tipologia quando gli eventi sono pochi; ``data/sedi.csv``
+(``comune,tipo,capienza,pubblico_atteso``, colonne facoltative) la sostituisce.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from festival.data import locations_2025, locations_potential
+from festival.routing import distance_matrix, travel_minutes
+
+SITES_PATH = os.path.join("data", "sedi.csv")
+
+TIPI = ("concerto", "masterclass")
+
+# Capienza di default: piazze per i concerti, sale comunali per le masterclass
+DEFAULT_CAPACITY = {"concerto": 300, "masterclass": 100}
+# Peso della media della tipologia nella stima del pubblico di un comune,
+# in numero di eventi equivalenti
+PRIOR_EVENTS = 1
+# Il k-esimo evento nello stesso comune attira SATURATION ** (k - 1) del pubblico atteso
+SATURATION = 0.85
+
+# Minuti di allestimento prima di un evento e massimo di guida tra due eventi
+SETUP_MIN = 120
+MAX_TRANSFER_MIN = 240
+
+# Pesi del punteggio, in spettatori equivalenti
+DEFAULT_WEIGHTS = {
+    "sponsor": 400,          # per evento richiesto da uno sponsor e non assegnato
+    "km": 0.3,               # per km percorso tra eventi consecutivi
+    "trasferimento": 2000,   # per trasferimento oltre il tempo disponibile
+}
+
+CHAINS = 64
+STEPS = 2000
+# Temperature iniziale e finale della tempra, in spettatori equivalenti
+T_START, T_END = 15.0, 0.2
+
+
+def expected_audience(events, sites_path=SITES_PATH):
+    """Pubblico atteso e capienza per comune e tipologia, come DataFrame indicizzato ``(comune, tipo)``."""
+    comuni = list(locations_2025) + list(locations_potential)
+    index = pd.MultiIndex.from_product([comuni, TIPI], names=["comune", "tipo"])
+    stats = events.groupby(["comune", "tipo"])["pubblico"].agg(["sum", "count"]).reindex(index, fill_value=0)
+    prior = events.groupby("tipo")["pubblico"].mean().reindex(TIPI).reindex(index, level="tipo")
+    sites = pd.DataFrame({
+        "pubblico_atteso": (stats["sum"] + PRIOR_EVENTS * prior) / (stats["count"] + PRIOR_EVENTS),
+        "capienza": [DEFAULT_CAPACITY[tipo] for _, tipo in index],
+    }, index=index)
+    if os.path.exists(sites_path):
+        overrides = pd.read_csv(sites_path).set_index(["comune", "tipo"])
+        sites.update(overrides[[c for c in sites.columns if c in overrides.columns]])
+    return sites
+
+
+class Problem:
+    """Dati del problema in forma di array, per valutare molti piani insieme."""
+
+    def __init__(self, events, requests=(), max_transfer=MAX_TRANSFER_MIN, weights=None, sites=None):
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        # Le province fuori dal Salento si aggiungono solo su richiesta degli sponsor
+        requested = {comune for comune, _, _ in requests}
+        self.comuni = list(locations_2025) + [c for c in locations_potential if c in requested]
+        coords = {**locations_2025, **locations_potential}
+        self.coordinates = [coords[c] for c in self.comuni]
+
+        edition = events["edizione"].max()
+        self.slots = events[events["edizione"] == edition].sort_values("inizio").reset_index(drop=True)
+        self.tipo = self.slots["tipo"].map(TIPI.index).to_numpy()
+
+        sites = expected_audience(events) if sites is None else sites
+        pairs = pd.MultiIndex.from_product([self.comuni, TIPI])
+        shape = (len(self.comuni), len(TIPI))
+        audience = sites["pubblico_atteso"].reindex(pairs).to_numpy().reshape(shape)
+        capacity = sites["capienza"].reindex(pairs).to_numpy().reshape(shape)
+        # Pubblico per (comune, evento), già limitato dalla capienza
+        self.audience = np.minimum(audience, capacity)[:, self.tipo]
+        self.decay = SATURATION ** np.arange(len(self.slots))
+
+        self.km = distance_matrix(self.coordinates)
+        minutes = travel_minutes(self.km)
+        gaps = (self.slots["inizio"].iloc[1:].to_numpy() - self.slots["fine"].iloc[:-1].to_numpy()) / np.timedelta64(1, "m")
+        allowed = np.minimum(gaps - SETUP_MIN, max_transfer)
+        # Coppie di comuni non raggiungibili tra un evento e il successivo: (evento, da, a)
+        self.too_far = minutes[None, :, :] > allowed[:, None, None]
+
+        index = {c: i for i, c in enumerate(self.comuni)}
+        self.requests = list(requests)
+        # Eventi richiesti per comune: per tipologia (colonne di TIPI) e di qualsiasi tipologia
+        # (ultima colonna); più richieste per lo stesso comune e tipologia si sommano
+        self.request_comuni = np.array(sorted({index[c] for c, _, _ in requests}), dtype=np.intp)
+        row = {c: i for i, c in enumerate(self.request_comuni)}
+        self.demand = np.zeros((len(self.request_comuni), len(TIPI) + 1))
+        for comune, tipo, n in requests:
+            self.demand[row[index[comune]], len(TIPI) if tipo is None else TIPI.index(tipo)] += n
+        self.slot_tipo = np.eye(len(TIPI))[self.tipo]
+
+        # Il calendario dell'ultima edizione è il piano di partenza
+        self.baseline = np.array([index[c] for c in self.slots["comune"]], dtype=np.intp)
+
+    def components(self, plans):
+        """Componenti del punteggio per ogni piano (righe di ``plans``: un comune per evento)."""
+        plans = np.atleast_2d(plans)
+        n_plans, n_slots = plans.shape
+        onehot = np.zeros((n_plans, n_slots, len(self.comuni)), dtype=np.int16)
+        onehot[np.arange(n_plans)[:, None], np.arange(n_slots), plans] = 1
+        # Quanti eventi lo stesso comune ha già ospitato prima di ognuno
+        rank = np.take_along_axis(np.cumsum(onehot, axis=1), plans[:, :, None], axis=2)[:, :, 0] - 1
+        audience = (self.audience[plans, np.arange(n_slots)] * self.decay[rank]).sum(axis=1)
+
+        if len(self.requests):
+            # Ogni evento vale per una sola richiesta: a quelle di una tipologia vanno gli
+            # eventi di quella tipologia, a quelle di qualsiasi tipologia gli eventi avanzati
+            counts = np.einsum("bsc,st->bct", onehot[:, :, self.request_comuni], self.slot_tipo)
+            typed = np.minimum(counts, self.demand[:, :-1])
+            untyped = np.minimum((counts - typed).sum(axis=2), self.demand[:, -1])
+            missing = self.demand.sum() - typed.sum(axis=(1, 2)) - untyped.sum(axis=1)
+        else:
+            missing = np.zeros(n_plans)
+
+        origin, destination = plans[:, :-1], plans[:, 1:]
+        km = self.km[origin, destination].sum(axis=1)
+        violations = self.too_far[np.arange(n_slots - 1), origin, destination].sum(axis=1)
+        return {
+            "pubblico": audience,
+            "richieste_mancanti": missing,
+            "km": km,
+            "trasferimenti_oltre_limite": violations,
+            "comuni": (onehot.sum(axis=1) > 0).sum(axis=1),
+        }
+
+    def score(self, plans, parts=None):
+        parts = self.components(plans) if parts is None else parts
+        w = self.weights
+        return (
+            parts["pubblico"]
+            - w["sponsor"] * parts["richieste_mancanti"]
+            - w["km"] * parts["km"]
+            - w["trasferimento"] * parts["trasferimenti_oltre_limite"]
+        )
+
+
+def anneal(problem, chains=CHAINS, steps=STEPS, seed=0):
+    """Tempra simulata con ``chains`` catene parallele; restituisce il piano migliore e i piani valutati."""
+    rng = np.random.default_rng(seed)
+    n_slots, n_comuni = len(problem.slots), len(problem.comuni)
+    rows = np.arange(chains)
+    plans = np.tile(problem.baseline, (chains, 1))
+    scores = problem.score(plans)
+    best_plan, best_score = plans[0].copy(), scores[0]
+
+    for temperature in np.geomspace(T_START, T_END, steps):
+        candidates = plans.copy()
+        # Metà delle catene sposta un evento in un altro comune, l'altra metà scambia due eventi
+        slot = rng.integers(n_slots, size=chains)
+        other = rng.integers(n_slots, size=chains)
+        move = rng.random(chains) < 0.5
+        candidates[rows, slot] = np.where(move, rng.integers(n_comuni, size=chains), plans[rows, other])
+        candidates[rows, other] = np.where(move, plans[rows, other], plans[rows, slot])
+
+        candidate_scores = problem.score(candidates)
+        delta = candidate_scores - scores
+        accept = (delta >= 0) | (rng.random(chains) < np.exp(np.minimum(delta, 0) / temperature))
+        plans[accept] = candidates[accept]
+        scores[accept] = candidate_scores[accept]
+
+        i = np.argmax(scores)
+        if scores[i] > best_score:
+            best_plan, best_score = plans[i].copy(), scores[i]
+    return best_plan, chains * (steps + 1)
+
+
+def polish(problem, plan):
+    """Ricerca locale esaustiva: ogni spostamento e ogni scambio valutati in un colpo, finché migliorano."""
+    n_slots, n_comuni = len(plan), len(problem.comuni)
+    slot, comune = np.divmod(np.arange(n_slots * n_comuni), n_comuni)
+    first, second = np.triu_indices(n_slots, k=1)
+    score = problem.score(plan)[0]
+    while True:
+        moves = np.tile(plan, (len(slot), 1))
+        moves[np.arange(len(slot)), slot] = comune
+        swaps = np.tile(plan, (len(first), 1))
+        swaps[np.arange(len(first)), first] = plan[second]
+        swaps[np.arange(len(first)), second] = plan[first]
+        neighbours = np.concatenate([moves, swaps])
+        scores = problem.score(neighbours)
+        i = np.argmax(scores)
+        if scores[i] <= score + 1e-9:
+            return plan, len(neighbours)
+        plan, score = neighbours[i], scores[i]
+
+
+def _summary(problem, plan):
+    parts = problem.components(plan)
+    summary = {key: float(value[0]) for key, value in parts.items()}
+    summary["punteggio"] = float(problem.score(plan, parts)[0])
+    return summary
+
+
+def optimize(events, requests=(), max_transfer=MAX_TRANSFER_MIN, chains=CHAINS, steps=STEPS, seed=0):
+    """Piano migliore per la prossima edizione.
+
+    ``requests`` sono le richieste degli sponsor ``(comune, tipo o None, eventi)``.
+    Restituisce il calendario con il comune assegnato e il pubblico previsto,
+    i riepiloghi del piano e del calendario attuale e i piani valutati al secondo.
+    """
+    problem = Problem(events, requests, max_transfer)
+    start = time.perf_counter()
+    plan, evaluated = anneal(problem, chains, steps, seed)
+    plan, neighbours = polish(problem, plan)
+    evaluated += neighbours
+    seconds = time.perf_counter() - start
+
+    slots = problem.slots[["inizio", "fine", "tipo"]].copy()
+    slots["comune"] = [problem.comuni[i] for i in plan]
+    slots["coordinate"] = [problem.coordinates[i] for i in plan]
+    rank = pd.Series(plan).groupby(plan).cumcount().to_numpy()
+    slots["pubblico_previsto"] = (problem.audience[plan, np.arange(len(plan))] * problem.decay[rank]).round().astype(int)
+    return {
+        "calendario": slots,
+        "piano": _summary(problem, plan),
+        "attuale": _summary(problem, problem.baseline),
+        "piani_valutati": evaluated,
+        "piani_al_secondo": evaluated / seconds,
+    }
@@ -0,0 +1,206 @@
+"""API JSON in sola lettura con le metriche del festival, per il sito e i social.
+
+Serve gli stessi numeri dell'app: dati storici, KPI, coordinate dei luoghi e
+prezzi dei pacchetti. Le risposte sono statiche per tutta la vita del
+processo, quindi vengono preparate una volta all'avvio in tutte le codifiche
+(identity, gzip e, se disponibile, brotli) con il rispettivo ETag forte:
+una richiesta costa solo la scelta della variante o un ``304 Not Modified``.
+
+Uso::
+
+    python -m festival.api --port 8502
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+
+import tornado.ioloop
+from tornado import httputil
+from tornado.httpserver import HTTPServer
+
+from festival.data import (
+    compute_kpis,
+    df_historical,
+    load_events,
+    locations_2025,
+    locations_potential,
+    sponsorship_packages,
+)
+from festival.warmup import is_ready
+
+try:
+    import brotli
+except ImportError:
+    # Senza il pacchetto brotli si servono solo gzip e identity
+    brotli = None
+
+API_PREFIX = "/api/v1"
+# Prontezza per il bilanciatore: 503 finché il riscaldamento delle cache non è completo
+READY_ENDPOINT = f"{API_PREFIX}/pronto"
+DEFAULT_PORT = 8502
+# Metodi accettati da ogni endpoint, riportati nell'header Allow delle risposte 405
+ALLOWED_METHODS = ("GET", "HEAD")
+
+# I numeri cambiano solo a un nuovo deploy: i client possono riusarli per qualche minuto
+# e poi rivalidarli con If-None-Match
+COMMON_HEADERS = {
+    "Cache-Control": "public, max-age=300, must-revalidate",
+    "Vary": "Accept-Encoding",
+    "Access-Control-Allow-Origin": "*",
+}
+
+
+class Resource:
+    """Una risposta JSON precalcolata in ogni codifica, con i rispettivi ETag."""
+
+    def __init__(self, payload):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # Ogni codifica è una rappresentazione diversa e ha quindi un ETag forte distinto
+        self.variants = {"identity": (body, f'"{digest}"')}
+        self.variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gz"')
+        if brotli is not None:
+            self.variants["br"] = (brotli.compress(body, quality=11), f'"{digest}-br"')
+
+    def negotiate(self, accept_encoding):
+        """Codifica preferita tra quelle accettate dal client (br, poi gzip, poi identity).
+
+        Le codifiche con ``q=0`` sono rifiutate anche se il client accetta ``*``
+        (RFC 9110 §12.5.3).
+        """
+        accepted, refused = set(), set()
+        for item in (accept_encoding or "").split(","):
+            name, *params = item.split(";")
+            name = name.strip().lower()
+            q = 1.0
+            for param in params:
+                key, _, value = param.partition("=")
+                if key.strip().lower() == "q":
+                    try:
+                        q = float(value.strip())
+                    except ValueError:
+                        q = 0.0
+            (accepted if q > 0 else refused).add(name)
+        accepted -= refused
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding not in refused and (encoding in accepted or "*" in accepted):
+                return encoding
+        return "identity"
+
+
+def _etag_matches(if_none_match, etag):
+    # Confronto debole come previsto per If-None-Match (RFC 9110 §13.1.2)
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class _Request(httputil.HTTPMessageDelegate):
+    """Una richiesta: le risposte sono già pronte, quindi basta scegliere la variante."""
+
+    def __init__(self, server, connection):
+        self.server = server
+        self.connection = connection
+
+    def headers_received(self, start_line, headers):
+        self.start_line = start_line
+        self.headers = headers
+
+    def data_received(self, chunk):
+        pass
+
+    def finish(self):
+        method = self.start_line.method
+        path = self.start_line.path.partition("?")[0].rstrip("/")
+        resource = self.server.resources.get(path)
+        if resource is None and path != READY_ENDPOINT:
+            self._send(404, "Not Found", httputil.HTTPHeaders({"Content-Length": "0"}), b"")
+            return
+        if method not in ALLOWED_METHODS:
+            headers = httputil.HTTPHeaders({"Allow": ", ".join(ALLOWED_METHODS), "Content-Length": "0"})
+            self._send(405, "Method Not Allowed", headers, b"")
+            return
+        if path == READY_ENDPOINT:
+            self._send_readiness(method)
+            return
+
+        encoding = resource.negotiate(self.headers.get("Accept-Encoding"))
+        body, etag = resource.variants[encoding]
+        headers = httputil.HTTPHeaders(COMMON_HEADERS)
+        headers["ETag"] = etag
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            self._send(304, "Not Modified", headers, b"")
+            return
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        headers["Content-Length"] = str(len(body))
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        self._send(200, "OK", headers, body if method == "GET" else b"")
+
+    def _send_readiness(self, method):
+        # L'unica risposta dinamica: non va mai messa in cache
+        ready = is_ready()
+        body = b'{"pronto":true}' if ready else b'{"pronto":false}'
+        headers = httputil.HTTPHeaders({
+            "Cache-Control": "no-store",
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Length": str(len(body)),
+        })
+        status, reason = (200, "OK") if ready else (503, "Service Unavailable")
+        self._send(status, reason, headers, body if method == "GET" else b"")
+
+    def _send(self, status, reason, headers, body):
+        self.connection.write_headers(httputil.ResponseStartLine("HTTP/1.1", status, reason), headers, body)
+        self.connection.finish()
+
+
+class Api(httputil.HTTPServerConnectionDelegate):
+    """Server HTTP minimo sopra il parser di Tornado, senza routing né RequestHandler:
+    a queste dimensioni di risposta il costo per richiesta è tutto nel framework."""
+
+    def __init__(self, payloads):
+        index = {"endpoints": [f"{API_PREFIX}/{name}" for name in payloads] + [READY_ENDPOINT]}
+        self.resources = {API_PREFIX: Resource(index)}
+        self.resources.update({f"{API_PREFIX}/{name}": Resource(p) for name, p in payloads.items()})
+
+    def start_request(self, server_conn, request_conn):
+        return _Request(self, request_conn)
+
+
+def build_payloads():
+    """Contenuto di ogni endpoint, con gli stessi dati mostrati dall'app."""
+    events = load_events()
+    return {
+        "storico": df_historical.to_dict(orient="records"),
+        "kpi": compute_kpis(df_historical, events),
+        "luoghi": {
+            "comuni_2025": [{"nome": n, "lat": lat, "lon": lon} for n, (lat, lon) in locations_2025.items()],
+            "potenziali": [{"nome": n, "lat": lat, "lon": lon} for n, (lat, lon) in locations_potential.items()],
+        },
+        "prezzi": sponsorship_packages,
+    }
+
+
+def make_app(payloads=None):
+    return Api(payloads if payloads is not None else build_payloads())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    server = HTTPServer(make_app())
+    server.listen(args.port, address=args.host)
+    print(f"API del festival su http://{args.host}:{args.port}{API_PREFIX}")
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == "__main__":
+    main()
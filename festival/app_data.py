@@ -0,0 +1,154 @@
+"""Strato dati condiviso dalle pagine.
+
+La cache di Streamlit tiene gli artefatti in memoria nel processo; sotto di
+essa ``festival.disk_cache`` li condivide tra i processi dello stesso server.
+"""
+
+import streamlit as st
+
+from festival.allocation import SITES_PATH, optimize
+from festival.boundaries import LEVELS_PATH, load_levels
+from festival.catchment import META_PATH, RASTER_PATH, PopulationGrid, venue_sets
+from festival.charts import audience_figure, platform_figure, reach_figure
+from festival.choropleth import styled_layer
+from festival.data import EVENTS_PATH, compute_kpis, df_historical, load_events
+from festival.disk_cache import disk_cached
+from festival.logo_wall import build as build_logo_wall, fingerprint as logo_fingerprint, wall_html
+from festival.routing import plan_schedule_route
+from festival.schedule import Schedule
+from festival.share_cards import card_content, card_png, edition_events
+from festival.sponsor_roi import histograms, simulate, summarize
+from festival.timeseries import Pyramid, load_series
+
+
+@st.cache_resource
+def load_boundary_levels():
+    # Livelli di dettaglio dei confini prodotti da `python -m festival.boundaries`
+    return load_levels()
+
+
+@st.cache_resource
+def population_grid():
+    # Raster della popolazione in memory-mapping, con le impronte delle sedi in cache;
+    # None finché non è stato preparato con `python -m festival.catchment`
+    return PopulationGrid.load()
+
+
+@st.cache_data
+def load_event_data():
+    return load_events()
+
+
+@st.cache_resource
+def load_schedule():
+    # Calendario con indice a intervalli, condiviso da tutte le sessioni
+    return Schedule(load_event_data())
+
+
+@st.cache_resource
+def series_pyramids():
+    # Piramidi multi-risoluzione delle serie orarie, condivise da tutte le sessioni
+    series, estimated = load_series(load_event_data())
+    return {metric: Pyramid(x, y) for metric, (x, y) in series.items()}, estimated
+
+
+def programme_html(schedule, comune, edition):
+    # Popup della mappa: il programma del comune nell'edizione scelta
+    events = schedule.for_comune(comune)
+    events = events[events["edizione"] == edition]
+    lines = [
+        f"{e.inizio:%d/%m %H:%M} · {e.tipo.capitalize()} · {e.sede}"
+        for e in events.itertuples()
+    ]
+    return f"<b>{comune}</b><br>" + ("<br>".join(lines) or "Nessun evento in calendario")
+
+
+@st.cache_data
+@disk_cached("grafici-storici")
+def historical_figures():
+    # I tre grafici della pagina Impatto dipendono solo dai dati storici
+    return {"pubblico": audience_figure(), "copertura": reach_figure(), "piattaforme": platform_figure()}
+
+
+@st.cache_data
+@disk_cached("coropleta", depends=(EVENTS_PATH, LEVELS_PATH))
+def choropleth_layer(metric, edition, method, level):
+    # Layer stilizzato in cache per metrica, edizione e livello di dettaglio dei confini
+    topology = load_boundary_levels()[level]["topology"] if level is not None else None
+    schedule = load_schedule()
+    popups = {comune: programme_html(schedule, comune, edition) for comune in schedule.events["comune"].unique()}
+    return styled_layer(load_event_data(), metric, edition, method, topology, popups)
+
+
+@st.cache_data
+@disk_cached("percorso", depends=(EVENTS_PATH,))
+def venue_route(edition):
+    # Giro tra i comuni dell'edizione, in partenza dal comune del primo evento
+    events = load_event_data()
+    return plan_schedule_route(events[events["edizione"] == edition])
+
+
+@st.cache_data(show_spinner="Simulazione in corso...")
+@disk_cached("simulazione-sponsor", depends=(EVENTS_PATH,))
+def sponsor_simulation(crescita_pubblico, crescita_copertura, riscatto_presenza, riscatto_online):
+    # In cache per scenario si tengono solo percentili e istogrammi, non le prove
+    results = simulate({
+        "crescita_pubblico": crescita_pubblico,
+        "crescita_copertura": crescita_copertura,
+        "riscatto_presenza": riscatto_presenza,
+        "riscatto_online": riscatto_online,
+    })
+    return summarize(results), {metric: histograms(results, metric) for metric in ("impressioni", "cpm")}
+
+
+@st.cache_data(show_spinner="Ottimizzazione del piano in corso...")
+@disk_cached("piano-allocazione", depends=(EVENTS_PATH, SITES_PATH))
+def allocation_plan(requests, max_transfer):
+    # `requests` è una tupla ordinata di (comune, tipo o None, eventi): stesse richieste, stessa chiave
+    return optimize(load_event_data(), requests, max_transfer)
+
+
+@st.cache_data(show_spinner="Calcolo dei bacini d'utenza...")
+@disk_cached("bacini", depends=(RASTER_PATH, META_PATH))
+def catchment_overlay(extra):
+    # Bacini delle sedi 2025 e con le località `extra` (tupla ordinata), con l'immagine per la mappa
+    grid = population_grid()
+    if grid is None:
+        return None
+    base, extended = venue_sets(extra)
+    current, proposed = grid.catchment(base), grid.catchment(extended)
+    png, bounds = grid.overlay(proposed)
+    # La griglia dei minuti serve solo all'immagine: in cache vanno i riepiloghi
+    keep = ("soglie", "totale", "piu_sedi", "sedi")
+    return {
+        "attuale": {k: current[k] for k in keep},
+        "ipotesi": {k: proposed[k] for k in keep},
+        "png": png,
+        "limiti": bounds,
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def _logo_wall(fingerprint):
+    # Gli atlanti si aggiornano una volta per processo e per versione del registro e dei loghi
+    manifest = build_logo_wall()
+    return wall_html(manifest), manifest["mancanti"]
+
+
+def logo_wall():
+    # HTML del muro dei loghi e sponsor senza logo; ricostruito solo se un logo cambia
+    return _logo_wall(logo_fingerprint())
+
+
+@st.cache_data(show_spinner=False)
+def share_card(ratio, event=None):
+    # Card dell'ultima edizione; `event` è la posizione dell'evento in ordine di data
+    events = load_event_data()
+    kpis = compute_kpis(df_historical, events)
+    row = None if event is None else edition_events(events, kpis["anno"]).iloc[event]
+    return card_png(card_content(kpis, events, row), ratio)
+
+
+def layer_style(feature):
+    # Lo stile di ogni comune è già calcolato nel layer in cache
+    return feature["properties"]["style"]
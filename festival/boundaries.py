@@ -0,0 +1,319 @@
+"""Confini comunali e provinciali semplificati per livelli di zoom.
+
+I confini ISTAT a piena risoluzione pesano diversi MB e renderebbero enorme
+l'HTML della mappa folium. Questo modulo li prepara una volta sola, offline:
+
+1. seleziona i comuni di ``locations_2025`` e le province di
+   ``locations_potential`` dai file ISTAT (convertiti in GeoJSON WGS84);
+2. costruisce una topologia ad archi condivisi, così i confini in comune tra
+   due comuni vengono semplificati una sola volta e restano combacianti;
+3. semplifica ogni arco con Douglas-Peucker per ogni livello di dettaglio;
+4. quantizza le coordinate su una griglia intera e le codifica a differenze.
+
+Il risultato è un unico file TopoJSON multi-livello, letto dall'app che
+serve il livello adatto allo zoom corrente.
+
+Uso::
+
+    ogr2ogr -f GeoJSON -t_srs EPSG:4326 data/confini/comuni.geojson Com01012025_WGS84.shp
+    ogr2ogr -f GeoJSON -t_srs EPSG:4326 data/confini/province.geojson ProvCM01012025_WGS84.shp
+    python -m festival.boundaries
+"""
+
+import argparse
+import json
+import os
+import unicodedata
+
+import numpy as np
+
+from festival.data import locations_2025, locations_potential
+
+# --- PERCORSI E PARAMETRI ---
+COMUNI_SOURCE = os.path.join("data", "confini", "comuni.geojson")
+PROVINCE_SOURCE = os.path.join("data", "confini", "province.geojson")
+LEVELS_PATH = os.path.join("data", "confini_lod.json")
+
+# Nome dell'oggetto TopoJSON con tutte le geometrie
+OBJECT_NAME = "confini"
+
+# Campi dei file ISTAT con la denominazione di comuni e province
+COMUNE_FIELD = "COMUNE"
+PROVINCIA_FIELD = "DEN_UTS"
+
+# Denominazioni ISTAT delle province potenziali
+PROVINCE_ISTAT = {
+    "Taranto": "Taranto",
+    "Bari": "Bari",
+    "Barletta (BAT)": "Barletta-Andria-Trani",
+}
+
+# Intervalli di zoom Leaflet serviti da ciascun livello di dettaglio;
+# oltre l'ultimo intervallo si continua a servire il livello più fine
+ZOOM_LEVELS = ((0, 7), (8, 9), (10, 11), (12, 13))
+
+# Griglia fine usata per riconoscere i vertici condivisi tra poligoni (~1 m)
+TOPOLOGY_GRID = 1e-5
+
+
+def degrees_per_pixel(zoom):
+    """Ampiezza in gradi di un pixel delle tile Web Mercator al livello ``zoom``."""
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def _normalize(name):
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(name.replace("-", " ").casefold().split())
+
+
+def _rings(geometry):
+    """Restituisce i poligoni di una geometria come liste di anelli (array Nx2)."""
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return []
+    return [[np.asarray(ring, dtype=float)[:, :2] for ring in polygon] for polygon in polygons]
+
+
+def load_features(comuni_path=COMUNI_SOURCE, province_path=PROVINCE_SOURCE):
+    """Seleziona dai file ISTAT i comuni 2025 e le province potenziali.
+
+    Restituisce le geometrie trovate e i nomi senza confine nei file.
+    """
+    wanted = [
+        (comuni_path, COMUNE_FIELD, "comune", {_normalize(n): n for n in locations_2025}),
+        (province_path, PROVINCIA_FIELD, "provincia",
+         {_normalize(v): k for k, v in PROVINCE_ISTAT.items() if k in locations_potential}),
+    ]
+    features = []
+    for path, field, kind, names in wanted:
+        with open(path, encoding="utf-8") as f:
+            collection = json.load(f)
+        for feature in collection["features"]:
+            name = names.get(_normalize(str(feature["properties"].get(field, ""))))
+            if name is not None:
+                features.append({"nome": name, "tipo": kind, "polygons": _rings(feature["geometry"])})
+    missing = set(locations_2025) | {k for k in PROVINCE_ISTAT if k in locations_potential}
+    missing -= {f["nome"] for f in features}
+    return features, sorted(missing)
+
+
+# --- TOPOLOGIA AD ARCHI CONDIVISI ---
+def _point_keys(ring):
+    q = np.round(ring / TOPOLOGY_GRID).astype(np.int64)
+    return (q[:, 0] << 32) ^ (q[:, 1] & 0xFFFFFFFF)
+
+
+def _junctions(rings):
+    """Vertici in cui due anelli smettono di condividere il confine.
+
+    Un vertice è un nodo se compare con coppie di vicini diverse in punti
+    diversi della topologia (come nella costruzione TopoJSON).
+    """
+    rows = []
+    for ring in rings:
+        keys = _point_keys(ring)[:-1]
+        prev, nxt = np.roll(keys, 1), np.roll(keys, -1)
+        rows.append(np.column_stack([keys, np.minimum(prev, nxt), np.maximum(prev, nxt)]))
+    rows = np.unique(np.concatenate(rows), axis=0)
+    points, counts = np.unique(rows[:, 0], return_counts=True)
+    return set(points[counts > 1].tolist())
+
+
+def _split_ring(ring, junctions):
+    """Taglia un anello chiuso negli archi compresi tra nodi consecutivi."""
+    open_ring = ring[:-1]
+    keys = _point_keys(open_ring)
+    cuts = np.flatnonzero(np.isin(keys, list(junctions)))
+    if cuts.size == 0:
+        # Anello isolato: parte dal vertice minimo, così anelli identici coincidono
+        start = int(np.argmin(keys))
+        rotated = np.roll(open_ring, -start, axis=0)
+        return [np.vstack([rotated, rotated[:1]])]
+    rotated = np.roll(open_ring, -cuts[0], axis=0)
+    rotated = np.vstack([rotated, rotated[:1]])
+    bounds = np.append(cuts - cuts[0], len(open_ring))
+    return [rotated[a:b + 1] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def build_topology(features):
+    """Scompone gli anelli in archi unici; gli anelli diventano liste di indici.
+
+    Gli indici negativi seguono la convenzione TopoJSON: ``~i`` è l'arco ``i``
+    percorso al contrario.
+    """
+    all_rings = [ring for f in features for polygon in f["polygons"] for ring in polygon]
+    junctions = _junctions(all_rings)
+    arcs, index = [], {}
+
+    def arc_id(arc):
+        keys = _point_keys(arc)
+        forward, backward = keys.tobytes(), keys[::-1].tobytes()
+        if forward in index:
+            return index[forward]
+        if backward in index:
+            return ~index[backward]
+        index[forward] = len(arcs)
+        arcs.append(arc)
+        return index[forward]
+
+    geometries = []
+    for f in features:
+        polygons = [[[arc_id(arc) for arc in _split_ring(ring, junctions)] for ring in polygon]
+                    for polygon in f["polygons"]]
+        geometries.append({"nome": f["nome"], "tipo": f["tipo"], "polygons": polygons})
+    return arcs, geometries
+
+
+# --- SEMPLIFICAZIONE E QUANTIZZAZIONE ---
+def _douglas_peucker(points, tolerance):
+    """Maschera dei vertici mantenuti da Douglas-Peucker (estremi sempre inclusi)."""
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        segment = b - a
+        inner = points[start + 1:end] - a
+        length = np.hypot(*segment)
+        if length == 0:
+            dist = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            dist = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+
+def simplify_arc(arc, tolerance):
+    """Semplifica un arco in coordinate lon/lat con tolleranza in gradi di latitudine."""
+    # Le distanze si misurano su un piano con la longitudine scalata per cos(lat)
+    scale = np.cos(np.radians(arc[:, 1].mean()))
+    planar = np.column_stack([arc[:, 0] * scale, arc[:, 1]])
+    if len(arc) > 3 and np.array_equal(arc[0], arc[-1]):
+        # Arco chiuso: si spezza nel vertice più lontano dall'origine
+        far = int(np.argmax(np.hypot(*(planar - planar[0]).T)))
+        keep = np.concatenate([
+            _douglas_peucker(planar[:far + 1], tolerance),
+            _douglas_peucker(planar[far:], tolerance)[1:],
+        ])
+        if keep.sum() < 4:
+            # Un anello deve restare un poligono: si tiene anche il vertice più lontano dalla corda
+            chord = planar[far] - planar[0]
+            off = np.abs(chord[0] * (planar[:, 1] - planar[0, 1]) - chord[1] * (planar[:, 0] - planar[0, 0]))
+            keep[int(np.argmax(off))] = True
+        return arc[keep]
+    return arc[_douglas_peucker(planar, tolerance)]
+
+
+def _quantize(arcs, translate, cell):
+    """Quantizza gli archi sulla griglia e li codifica a differenze (formato TopoJSON)."""
+    encoded = []
+    for arc in arcs:
+        q = np.round((arc - translate) / cell).astype(np.int64)
+        # I vertici collassati sulla stessa cella si scartano, estremi inclusi nel confronto
+        q = q[np.concatenate([[True], np.any(np.diff(q, axis=0) != 0, axis=1)])]
+        if len(q) == 1:
+            q = np.vstack([q, q])
+        encoded.append(np.vstack([q[:1], np.diff(q, axis=0)]).tolist())
+    return encoded
+
+
+def _ring_length(ring, arcs):
+    return sum(len(arcs[i if i >= 0 else ~i]) - 1 for i in ring) + 1
+
+
+def build_level(arcs, geometries, min_zoom, max_zoom):
+    """Costruisce la topologia di un livello di dettaglio."""
+    # Errore massimo di mezzo pixel allo zoom più alto servito dal livello
+    tolerance = degrees_per_pixel(max_zoom) / 2
+    cell = tolerance / 2
+    simplified = [simplify_arc(arc, tolerance) for arc in arcs]
+    stacked = np.concatenate(simplified)
+    translate = stacked.min(axis=0)
+    encoded = _quantize(simplified, translate, cell)
+
+    topo_geometries = []
+    for g in geometries:
+        polygons = []
+        for polygon in g["polygons"]:
+            rings = [ring for ring in polygon if _ring_length(ring, encoded) >= 4]
+            # Se l'anello esterno collassa il poligono non è più visibile a questo zoom
+            if rings and rings[0] is polygon[0]:
+                polygons.append(rings)
+        if not polygons:
+            continue
+        geometry = {"type": "MultiPolygon", "arcs": polygons} if len(polygons) > 1 \
+            else {"type": "Polygon", "arcs": polygons[0]}
+        geometry["properties"] = {"nome": g["nome"], "tipo": g["tipo"]}
+        topo_geometries.append(geometry)
+
+    return {
+        "min_zoom": min_zoom,
+        "max_zoom": max_zoom,
+        "topology": {
+            "type": "Topology",
+            "transform": {"scale": [cell, cell], "translate": translate.tolist()},
+            "objects": {OBJECT_NAME: {"type": "GeometryCollection", "geometries": topo_geometries}},
+            "arcs": encoded,
+        },
+    }
+
+
+def build_levels(features, zoom_levels=ZOOM_LEVELS):
+    arcs, geometries = build_topology(features)
+    return [build_level(arcs, geometries, lo, hi) for lo, hi in zoom_levels]
+
+
+# --- LETTURA LATO APP ---
+def load_levels(path=LEVELS_PATH):
+    """Legge i livelli preparati; ``None`` se il preprocessing non è stato eseguito."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["levels"]
+    except FileNotFoundError:
+        return None
+
+
+def level_index(levels, zoom):
+    """Indice del livello che serve lo ``zoom`` richiesto."""
+    for i, level in enumerate(levels):
+        if zoom <= level["max_zoom"]:
+            return i
+    return len(levels) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--comuni", default=COMUNI_SOURCE)
+    parser.add_argument("--province", default=PROVINCE_SOURCE)
+    parser.add_argument("--output", default=LEVELS_PATH)
+    args = parser.parse_args()
+
+    features, missing = load_features(args.comuni, args.province)
+    if missing:
+        print("Confini non trovati per: " + ", ".join(missing))
+    levels = build_levels(features)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "levels": levels}, f, separators=(",", ":"))
+
+    for level in levels:
+        size = len(json.dumps(level["topology"], separators=(",", ":")))
+        points = sum(len(arc) for arc in level["topology"]["arcs"])
+        print(f"zoom {level['min_zoom']:>2}-{level['max_zoom']:<2}: {points:>7} vertici, {size / 1024:8.1f} KB")
+    print(f"Scritto {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Bacini d'utenza delle sedi: residenti a 15, 30 e 45 minuti da un evento.
+
+La popolazione viene da una griglia raster (ad esempio GHS-POP del JRC o
+WorldPop) ritagliata sulla Puglia ed esportata da GDAL in formato EHdr.
+Questo modulo la converte una volta sola, offline, in un array ``.npy`` con
+i metadati di georeferenziazione accanto; l'app lo apre in memory-mapping,
+quindi legge dal disco solo le celle attorno alle sedi.
+
+Per ogni sede si calcola una volta l'impronta: i minuti di viaggio stimati
+(come in ``festival.routing``) verso ogni cella entro l'ultima soglia, con
+un'unica operazione vettoriale sulla finestra di celle. Le impronte restano
+in cache per sede, così un insieme di sedi si combina con qualche minimo e
+somma di array: aggiungere una sede in un'ipotesi ("e se aggiungessimo
+Bari?") costa solo l'impronta della nuova sede. Per ogni insieme di sedi si
+ottengono i residenti raggiunti, quelli raggiunti da più sedi
+(sovrapposizione) e quelli raggiunti da una sola sede.
+
+Uso::
+
+    gdal_translate -of EHdr -ot Float32 -projwin 14.9 42.3 18.6 39.7 GHS_POP_E2025_4326_3ss.tif data/popolazione/puglia.bil
+    python -m festival.catchment [--aggrega 3]
+    python -m festival.catchment --query --aggiungi Bari
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from festival.data import locations_2025, locations_potential
+from festival.geo import haversine_km
+from festival.routing import AVG_SPEED_KMH, DETOUR_FACTOR, travel_minutes
+
+# --- PERCORSI E PARAMETRI ---
+SOURCE_PATH = os.path.join("data", "popolazione", "puglia.bil")
+RASTER_PATH = os.path.join("data", "popolazione.npy")
+META_PATH = os.path.join("data", "popolazione.json")
+
+# Soglie dei bacini in minuti di viaggio
+THRESHOLDS = (15, 30, 45)
+
+# Righe del raster sorgente convertite per volta, per non caricarlo tutto in memoria
+CHUNK_ROWS = 512
+
+# Colori RGBA dei bacini sulla mappa, dal più vicino al più lontano
+OVERLAY_COLORS = ((26, 82, 118, 120), (93, 173, 226, 95), (133, 193, 233, 70))
+# Lato massimo in pixel dell'immagine sovrapposta alla mappa
+OVERLAY_MAX_SIDE = 1024
+
+_UNREACHED = 255
+
+
+def reach_km(minutes):
+    """Raggio in linea d'aria raggiungibile in ``minutes``, inverso di ``routing.travel_minutes``."""
+    return minutes / 60 * AVG_SPEED_KMH / DETOUR_FACTOR
+
+
+# --- CONVERSIONE DEL RASTER ---
+def _read_ehdr(path):
+    """Raster EHdr (``.bil`` e ``.hdr``) in memory-mapping e la sua intestazione."""
+    with open(os.path.splitext(path)[0] + ".hdr", encoding="ascii") as f:
+        header = {key.upper(): value.strip() for key, value in (line.split(None, 1) for line in f if line.strip())}
+    kind = {"FLOAT": "f", "SIGNEDINT": "i"}.get(header.get("PIXELTYPE", "").upper(), "u")
+    order = ">" if header.get("BYTEORDER", "I").upper() == "M" else "<"
+    dtype = np.dtype(f"{order}{kind}{int(header.get('NBITS', 8)) // 8}")
+    shape = (int(header["NROWS"]), int(header["NCOLS"]))
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape), header
+
+
+def prepare(source=SOURCE_PATH, raster_path=RASTER_PATH, meta_path=META_PATH, factor=1):
+    """Converte il raster sorgente in ``.npy`` float32, sommando blocchi ``factor`` x ``factor``."""
+    source_grid, header = _read_ehdr(source)
+    nodata = float(header["NODATA"]) if "NODATA" in header else None
+    rows, cols = (n // factor for n in source_grid.shape)
+    out = np.lib.format.open_memmap(raster_path, mode="w+", dtype=np.float32, shape=(rows, cols))
+    step = max(CHUNK_ROWS // factor, 1) * factor
+    for start in range(0, rows * factor, step):
+        block = np.array(source_grid[start:min(start + step, rows * factor), :cols * factor], dtype=np.float64)
+        # Celle senza dato (mare, fuori confine) e valori negativi non sono residenti
+        if nodata is not None:
+            block[block == nodata] = 0
+        block[~np.isfinite(block) | (block < 0)] = 0
+        summed = block.reshape(-1, factor, cols, factor).sum(axis=(1, 3))
+        out[start // factor:start // factor + len(summed)] = summed
+    out.flush()
+
+    dlon, dlat = float(header["XDIM"]), float(header["YDIM"])
+    meta = {
+        # Bordo nord-ovest della prima cella (ULXMAP e ULYMAP sono il suo centro)
+        "nord": float(header["ULYMAP"]) + dlat / 2,
+        "ovest": float(header["ULXMAP"]) - dlon / 2,
+        "passo_lat": dlat * factor,
+        "passo_lon": dlon * factor,
+        "righe": rows,
+        "colonne": cols,
+        "fonte": os.path.basename(source),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta, float(out.sum(dtype=np.float64))
+
+
+# --- BACINI ---
+class PopulationGrid:
+    """Griglia di popolazione in memory-mapping con le impronte delle sedi in cache."""
+
+    def __init__(self, raster_path=RASTER_PATH, meta_path=META_PATH, thresholds=THRESHOLDS):
+        self.population = np.load(raster_path, mmap_mode="r")
+        with open(meta_path, encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.thresholds = tuple(thresholds)
+        self._footprints = {}
+        self._results = {}
+
+    @classmethod
+    def load(cls, raster_path=RASTER_PATH, meta_path=META_PATH):
+        """Griglia dai file preparati, o ``None`` se non sono ancora stati generati."""
+        if not (os.path.exists(raster_path) and os.path.exists(meta_path)):
+            return None
+        return cls(raster_path, meta_path)
+
+    def _centres(self, r0, r1, c0, c1):
+        m = self.meta
+        lat = m["nord"] - (np.arange(r0, r1) + 0.5) * m["passo_lat"]
+        lon = m["ovest"] + (np.arange(c0, c1) + 0.5) * m["passo_lon"]
+        return lat[:, None], lon[None, :]
+
+    def footprint(self, lat, lon):
+        """Minuti verso le celle entro l'ultima soglia e residenti raggiunti per soglia.
+
+        Restituisce ``(riga, colonna, minuti uint8, raggiunti)``; i residenti
+        raggiunti da una sede non dipendono dalle altre e si calcolano qui una volta.
+        """
+        key = (round(float(lat), 6), round(float(lon), 6))
+        if key not in self._footprints:
+            m = self.meta
+            radius = reach_km(max(self.thresholds))
+            dlat = radius / 111.0
+            dlon = radius / (111.0 * np.cos(np.radians(lat)))
+            r0 = int(np.clip(np.floor((m["nord"] - lat - dlat) / m["passo_lat"]), 0, m["righe"]))
+            r1 = int(np.clip(np.ceil((m["nord"] - lat + dlat) / m["passo_lat"]), 0, m["righe"]))
+            c0 = int(np.clip(np.floor((lon - dlon - m["ovest"]) / m["passo_lon"]), 0, m["colonne"]))
+            c1 = int(np.clip(np.ceil((lon + dlon - m["ovest"]) / m["passo_lon"]), 0, m["colonne"]))
+            cell_lat, cell_lon = self._centres(r0, r1, c0, c1)
+            minutes = travel_minutes(haversine_km(lat, lon, cell_lat, cell_lon))
+            minutes = np.where(minutes <= max(self.thresholds), np.ceil(minutes), _UNREACHED).astype(np.uint8)
+            reached = self._by_threshold(minutes, np.asarray(self.population[r0:r1, c0:c1]))
+            self._footprints[key] = (r0, c0, minutes, reached)
+        return self._footprints[key]
+
+    def _by_threshold(self, minutes, population):
+        # Residenti per minuto di viaggio in un solo passaggio, poi cumulati fino a ogni soglia;
+        # le celle fuori da ogni bacino, spesso la maggior parte della regione, si saltano
+        inside = minutes <= max(self.thresholds)
+        per_minute = np.bincount(minutes[inside], weights=population[inside], minlength=_UNREACHED + 1)
+        cumulative = np.cumsum(per_minute)
+        return {t: float(cumulative[t]) for t in self.thresholds}
+
+    def catchment(self, venues):
+        """Bacini di un insieme di sedi ``{nome: [lat, lon]}``, in cache per insieme.
+
+        Restituisce i residenti raggiunti per soglia (in totale, da più sedi e
+        per sede, anche in esclusiva) e la griglia dei minuti alla sede più
+        vicina sulla regione interessata.
+        """
+        key = frozenset((name, tuple(coord)) for name, coord in venues.items())
+        if key in self._results:
+            return self._results[key]
+        prints = {name: self.footprint(*coord) for name, coord in venues.items()}
+        prints = {name: fp for name, fp in prints.items() if fp[2].size}
+        if not prints:
+            result = {"soglie": self.thresholds, "totale": dict.fromkeys(self.thresholds, 0.0),
+                      "piu_sedi": dict.fromkeys(self.thresholds, 0.0), "sedi": {}, "minuti": None, "regione": None}
+            self._results[key] = result
+            return result
+
+        # Regione che contiene tutte le impronte: solo queste celle si leggono dal disco
+        r0 = min(fp[0] for fp in prints.values())
+        c0 = min(fp[1] for fp in prints.values())
+        r1 = max(fp[0] + fp[2].shape[0] for fp in prints.values())
+        c1 = max(fp[1] + fp[2].shape[1] for fp in prints.values())
+        population = np.asarray(self.population[r0:r1, c0:c1])
+        # Minuti alla sede più vicina e alla seconda: una cella è nel bacino a T minuti
+        # se la prima è entro T, ed è raggiunta da più sedi se lo è anche la seconda
+        nearest = np.full((r1 - r0, c1 - c0), _UNREACHED, dtype=np.uint8)
+        second = nearest.copy()
+        windows = {}
+        for name, (fr, fc, minutes, _) in prints.items():
+            window = windows[name] = np.s_[fr - r0:fr - r0 + minutes.shape[0], fc - c0:fc - c0 + minutes.shape[1]]
+            np.minimum(second[window], np.maximum(nearest[window], minutes), out=second[window])
+            np.minimum(nearest[window], minutes, out=nearest[window])
+
+        venues_out = {}
+        for name, (_, _, minutes, reached) in prints.items():
+            weights = population[windows[name]]
+            runner_up = second[windows[name]]
+            venues_out[name] = {
+                "raggiunti": reached,
+                # Solo questa sede raggiunge la cella entro T: la seconda sede più vicina è oltre T
+                "esclusivi": {t: float(weights[(minutes <= t) & (runner_up > t)].sum(dtype=np.float64))
+                              for t in self.thresholds},
+            }
+        result = {
+            "soglie": self.thresholds,
+            "totale": self._by_threshold(nearest, population),
+            "piu_sedi": self._by_threshold(second, population),
+            "sedi": venues_out,
+            "minuti": nearest,
+            "regione": (r0, r1, c0, c1),
+        }
+        self._results[key] = result
+        return result
+
+    def overlay(self, result, max_side=OVERLAY_MAX_SIDE):
+        """PNG trasparente delle fasce dei bacini e i suoi limiti ``[[sud, ovest], [nord, est]]``.
+
+        Le righe si ricampionano in Web Mercator, come le tile, così le fasce
+        combaciano con la mappa anche su tutta l'altezza della regione.
+        """
+        if result["minuti"] is None:
+            return None, None
+        r0, r1, c0, c1 = result["regione"]
+        nearest = result["minuti"]
+        stride = max(1, -(-max(nearest.shape) // max_side))
+        # Minimo per blocchi: una sede vicina resta visibile anche dopo la riduzione
+        h, w = (-(-n // stride) * stride for n in nearest.shape)
+        padded = np.full((h, w), _UNREACHED, dtype=np.uint8)
+        padded[:nearest.shape[0], :nearest.shape[1]] = nearest
+        reduced = padded.reshape(h // stride, stride, w // stride, stride).min(axis=(1, 3))
+
+        m = self.meta
+        north = m["nord"] - r0 * m["passo_lat"]
+        south = m["nord"] - (r0 + h) * m["passo_lat"]
+        west = m["ovest"] + c0 * m["passo_lon"]
+        east = m["ovest"] + (c0 + w) * m["passo_lon"]
+        mercator = lambda lat: np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))  # noqa: E731
+        target = np.linspace(mercator(north), mercator(south), len(reduced))
+        source_lat = np.degrees(2 * np.arctan(np.exp(target)) - np.pi / 2)
+        rows = np.clip(((north - source_lat) / (north - south) * len(reduced)).astype(int), 0, len(reduced) - 1)
+        reduced = reduced[rows]
+
+        # Palette: 0 trasparente, poi una fascia per soglia
+        band = np.searchsorted(np.array(self.thresholds), reduced, side="left") + 1
+        band[reduced == _UNREACHED] = 0
+        image = Image.fromarray(band.astype(np.uint8), mode="P")
+        image.putpalette([0, 0, 0] + [c for color in OVERLAY_COLORS for c in color[:3]])
+        image.info["transparency"] = bytes([0] + [color[3] for color in OVERLAY_COLORS])
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue(), [[south, west], [north, east]]
+
+
+def venue_sets(extra=()):
+    """Sedi 2025 e le stesse con le località potenziali ``extra`` aggiunte."""
+    base = dict(locations_2025)
+    return base, {**base, **{name: locations_potential[name] for name in extra}}
+
+
+def _number(value):
+    return f"{value:,.0f}".replace(",", ".")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=SOURCE_PATH)
+    parser.add_argument("--aggrega", type=int, default=1, help="somma blocchi N x N di celle")
+    parser.add_argument("--query", action="store_true", help="calcola i bacini dal raster già preparato")
+    parser.add_argument("--aggiungi", nargs="*", default=[], choices=list(locations_potential))
+    args = parser.parse_args()
+
+    if not args.query:
+        meta, total = prepare(args.source, factor=args.aggrega)
+        print(f"{meta['righe']} x {meta['colonne']} celle, {_number(total)} residenti -> {RASTER_PATH}")
+        return
+
+    grid = PopulationGrid.load()
+    if grid is None:
+        parser.error(f"{RASTER_PATH} mancante: va prima preparato con python -m festival.catchment")
+    base, extended = venue_sets(args.aggiungi)
+    scenarios = [("Sedi 2025", base)]
+    if args.aggiungi:
+        scenarios.append(("+ " + ", ".join(args.aggiungi), extended))
+    for label, venues in scenarios:
+        start = time.perf_counter()
+        result = grid.catchment(venues)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{label} ({elapsed:.0f} ms)")
+        for t in result["soglie"]:
+            print(f"  {t:>2} min: {_number(result['totale'][t]):>12} residenti, {_number(result['piu_sedi'][t]):>12} da più sedi")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Grafici Plotly dell'andamento storico, costruiti una volta e tenuti in cache dall'app."""
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from festival.data import df_historical
+
+
+def audience_figure(df_historical=df_historical):
+    fig_audience = px.line(
+        df_historical, x='Anno', y='Pubblico in Presenza',
+        markers=True, text=df_historical['Pubblico in Presenza'],
+        labels={'Pubblico in Presenza': 'Numero di Persone', 'Anno': 'Anno del Festival'}
+    )
+    fig_audience.update_traces(textposition="top center", line=dict(color='#1a5276', width=4))
+    fig_audience.update_layout(
+        xaxis=dict(tickmode='linear'),
+        yaxis_title="Pubblico in Presenza",
+        height=400,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#2c3e50')
+    )
+    return fig_audience
+
+
+def reach_figure(df_historical=df_historical):
+    # Solo per 2024 e 2025 (2023 non disponibile)
+    df_copertura = df_historical[df_historical['Anno'] >= 2024].copy()
+
+    fig_reach = px.line(
+        df_copertura, x='Anno', y='Copertura Totale',
+        markers=True,
+        text=df_copertura['Copertura Totale'].apply(lambda x: f"{x/1000000:.1f}M" if x > 1000000 else f"{x/1000:.0f}K"),
+        labels={'Copertura Totale': 'Utenti Unici Raggiunti', 'Anno': 'Anno del Festival'}
+    )
+    fig_reach.update_traces(textposition="top center", line=dict(color='#d35400', width=4))
+    fig_reach.update_layout(
+        xaxis=dict(tickmode='linear'),
+        yaxis_title="Copertura Social (Utenti)",
+        height=400,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#2c3e50')
+    )
+    return fig_reach
+
+
+def platform_figure():
+    # Grafico a barre per Facebook vs Instagram
+    fig_platform = go.Figure()
+
+    fig_platform.add_trace(go.Bar(
+        name='Facebook',
+        x=['2024', '2025 (Prev.)'],
+        y=[382873, 450000],
+        marker_color='#1877f2',
+        text=[f"{382873/1000:.0f}K", f"{450000/1000:.0f}K"],
+        textposition='auto'
+    ))
+
+    fig_platform.add_trace(go.Bar(
+        name='Instagram',
+        x=['2024', '2025 (Prev.)'],
+        y=[1400000, 1750000],
+        marker_color='#E4405F',
+        text=['1.4M', '1.75M'],
+        textposition='auto'
+    ))
+
+    fig_platform.update_layout(
+        title='Copertura per Piattaforma Social',
+        xaxis_title='Anno',
+        yaxis_title='Utenti Raggiunti',
+        barmode='group',
+        height=400,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#2c3e50')
+    )
+    return fig_platform
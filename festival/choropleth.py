@@ -0,0 +1,169 @@
+"""Coropleta dei comuni per pubblico, eventi ospitati e copertura.
+
+Gli eventi vengono aggregati per comune con un join vettoriale sui codici
+categoriali di ``comuni_2025``; le classi si calcolano con NumPy (quantili o
+Jenks) e ogni layer stilizzato è indipendente dalla mappa base, così l'app
+può tenerlo in cache per metrica ed edizione e scambiarlo senza ricostruire
+la ``folium.Map``.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+from festival.boundaries import OBJECT_NAME
+from festival.data import comuni_2025, locations_2025
+
+# Metriche disponibili: colonna aggregata -> etichetta
+METRICS = {
+    "pubblico": "Pubblico in presenza",
+    "eventi": "Eventi ospitati",
+    "copertura": "Copertura social",
+}
+
+METHODS = ("quantili", "jenks")
+
+# Scala sequenziale ColorBrewer "Reds", coerente con i pin rossi dei comuni 2025
+PALETTE = ["#fee5d9", "#fcae91", "#fb6a4a", "#de2d26", "#a50f15"]
+
+PROVINCE_STYLE = {"color": "#2e86c1", "weight": 1.5, "fillColor": "#2e86c1", "fillOpacity": 0.15}
+
+
+def comune_metrics(events, edition, comuni=comuni_2025):
+    """Aggrega gli eventi di un'edizione per comune.
+
+    I comuni senza eventi restano a zero; gli eventi in comuni fuori elenco
+    vengono ignorati.
+    """
+    events = events[events["edizione"] == edition]
+    codes = pd.Categorical(events["comune"], categories=comuni).codes
+    valid = codes >= 0
+    codes = codes[valid]
+    n = len(comuni)
+    return pd.DataFrame({
+        "pubblico": np.bincount(codes, weights=events["pubblico"].to_numpy()[valid], minlength=n),
+        "eventi": np.bincount(codes, minlength=n).astype(float),
+        "copertura": np.bincount(codes, weights=events["copertura"].to_numpy()[valid], minlength=n),
+    }, index=pd.Index(comuni, name="comune"))
+
+
+def _jenks_breaks(values, k):
+    """Natural breaks di Fisher-Jenks: programmazione dinamica vettorizzata per classe."""
+    x = np.sort(values)
+    n = len(x)
+    s1 = np.concatenate([[0.0], np.cumsum(x)])
+    s2 = np.concatenate([[0.0], np.cumsum(x * x)])
+    i = np.arange(n)[:, None]
+    j = np.arange(n)[None, :]
+    count = j - i + 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # ssd[i, j]: scarto quadratico del segmento x[i..j]
+        ssd = s2[j + 1] - s2[i] - (s1[j + 1] - s1[i]) ** 2 / count
+    ssd = np.where(count > 0, ssd, np.inf)
+
+    cost = ssd[0].copy()
+    starts = np.zeros((k, n), dtype=int)
+    for c in range(1, k):
+        # Ultima classe da i a j, le precedenti coprono x[0..i-1]
+        total = cost[:-1, None] + ssd[1:, :]
+        best = np.argmin(total, axis=0)
+        cost = total[best, np.arange(n)]
+        starts[c] = best + 1
+
+    breaks = [x[-1]]
+    end = n - 1
+    for c in range(k - 1, 0, -1):
+        end = starts[c, end] - 1
+        breaks.append(x[end])
+    breaks.append(x[0])
+    return np.array(breaks[::-1])
+
+
+def class_breaks(values, k=5, method="quantili"):
+    """Limiti delle classi ``[min, b1, ..., max]`` (al più ``k`` classi distinte)."""
+    values = np.asarray(values, dtype=float)
+    distinct = np.unique(values)
+    if len(distinct) <= k:
+        # Pochi valori distinti: una classe per valore
+        return np.concatenate([distinct[:1], distinct])
+    if method == "jenks":
+        breaks = _jenks_breaks(values, k)
+    else:
+        breaks = np.quantile(values, np.linspace(0, 1, k + 1))
+    return np.unique(breaks)
+
+
+def classify(values, breaks):
+    """Classe di ciascun valore; un valore uguale a un limite sta nella classe inferiore."""
+    return np.searchsorted(breaks[1:-1], values, side="left")
+
+
+def _colors(n_classes):
+    return [PALETTE[i] for i in np.linspace(0, len(PALETTE) - 1, n_classes).round().astype(int)]
+
+
+def _format(metric, value):
+    if metric == "copertura" and value >= 1000:
+        return f"{value / 1000:,.0f}K".replace(",", ".")
+    return f"{value:,.0f}".replace(",", ".")
+
+
+def styled_layer(events, metric, edition, method="quantili", topology=None, popups=None):
+    """Dati stilizzati della coropleta per una metrica e un'edizione.
+
+    Con ``topology`` (un livello di ``festival.boundaries``) i comuni vengono
+    colorati sui confini; senza, si produce un GeoJSON di punti da disegnare
+    come cerchi. Lo stile è già scritto in ``properties.style``; ``popups``
+    associa a ogni comune l'HTML del popup (``properties.programma``).
+    """
+    popups = popups or {}
+    values = comune_metrics(events, edition)[metric]
+    breaks = class_breaks(values.to_numpy(), len(PALETTE), method)
+    colors = _colors(max(len(breaks) - 1, 1))
+    codes = classify(values.to_numpy(), breaks)
+    classes = dict(zip(values.index, codes))
+    label = METRICS[metric]
+
+    def properties(comune):
+        color = colors[classes[comune]]
+        return {
+            "nome": comune,
+            "valore": f"{label}: {_format(metric, values[comune])}",
+            "programma": popups.get(comune, f"<b>{comune}</b>"),
+            "style": {"color": "#7b241c", "weight": 1, "fillColor": color, "fillOpacity": 0.75},
+        }
+
+    if topology is not None:
+        data = copy.deepcopy(topology)
+        for geometry in data["objects"][OBJECT_NAME]["geometries"]:
+            props = geometry["properties"]
+            if props["tipo"] == "comune" and props["nome"] in classes:
+                props.update(properties(props["nome"]))
+            else:
+                props.update({
+                    "valore": "Evento organizzabile",
+                    "programma": f"<b>{props['nome']}</b><br>Evento organizzabile",
+                    "style": PROVINCE_STYLE,
+                })
+        kind = "topology"
+    else:
+        data = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                    "properties": properties(comune),
+                }
+                for comune, (lat, lon) in locations_2025.items()
+            ],
+        }
+        kind = "geojson"
+
+    # La legenda riporta l'intervallo effettivo dei comuni in ciascuna classe
+    legend = [
+        (_format(metric, values[codes == i].min()), _format(metric, values[codes == i].max()), color)
+        for i, color in enumerate(colors) if (codes == i).any()
+    ]
+    return {"kind": kind, "data": data, "legend": legend, "label": label}
@@ -0,0 +1,101 @@
+"""Dati del festival condivisi tra l'app e le pipeline di preprocessing."""
+
+import os
+
+import pandas as pd
+
+# --- DATI ---
+# Dati storici e previsioni (basati sul documento originale)
+data = {
+    'Anno': [2023, 2024, 2025],
+    'Pubblico in Presenza': [3000, 3200, 3800],
+    'Copertura Totale': [0, 1782873, 2200000],  # 2023 non disponibile, 2024: FB 382873 + IG 1.4M
+    'Copertura Facebook': [0, 382873, 450000],
+    'Copertura Instagram': [0, 1400000, 1750000],
+    'Eventi Totali': [30, 18, 34],  # 2023: 21+6+3, 2024: 18, 2025: 24+10
+    'Comuni Coinvolti': [17, 11, 16]
+}
+df_historical = pd.DataFrame(data)
+
+# Coordinate per la mappa (dal documento originale)
+locations_2025 = {
+    "Alessano": [39.8967, 18.3258],
+    "Andrano": [40.0053, 18.3675],
+    "Castrignano del Capo": [39.8458, 18.3597],
+    "Corsano": [39.9036, 18.3864],
+    "Diso": [40.0444, 18.4069],
+    "Gagliano del Capo": [39.8347, 18.3683],
+    "Lecce": [40.3515, 18.1750],
+    "Matino": [40.0367, 18.1206],
+    "Morciano di Leuca": [39.8544, 18.3575],
+    "Presicce-Acquarica": [39.9097, 18.2653],
+    "Salve": [39.9167, 18.3167],
+    "Specchia": [39.9656, 18.3053],
+    "Taurisano": [39.9678, 18.2294],
+    "Taviano": [40.0072, 18.0781],
+    "Tricase": [39.9333, 18.3583],
+    "Ugento": [39.9167, 18.1667]
+}
+
+locations_potential = {
+    "Taranto": [40.4762, 17.2297],
+    "Bari": [41.1177, 16.8719],
+    "Barletta (BAT)": [41.3203, 16.2844]
+}
+
+# Lista comuni 2025
+comuni_2025 = list(locations_2025.keys())
+
+# Dataset a livello di evento (una riga per evento, più edizioni)
+EVENTS_PATH = os.path.join("data", "eventi.csv")
+
+
+def load_events(path=EVENTS_PATH):
+    """Legge il dataset degli eventi; le righe ``#`` in testa sono note sulla fonte."""
+    return pd.read_csv(path, comment="#", parse_dates=["inizio", "fine"])
+
+# Pacchetti di sponsorizzazione (prezzi in euro), nell'ordine della tabella prezzi:
+# i pacchetti per tipologia coprono solo concerti o solo masterclass,
+# quelli combinati includono entrambe le tipologie
+sponsorship_packages = [
+    {"pacchetto": "1 Evento", "tipologia": "Concerto", "concerti": 1, "masterclass": 0, "prezzo": 600},
+    {"pacchetto": "3 Eventi", "tipologia": "Concerto", "concerti": 3, "masterclass": 0, "prezzo": 1500},
+    {"pacchetto": "5 Eventi", "tipologia": "Concerto", "concerti": 5, "masterclass": 0, "prezzo": 2500},
+    {"pacchetto": "1 Evento", "tipologia": "Masterclass", "concerti": 0, "masterclass": 1, "prezzo": 500},
+    {"pacchetto": "3 Eventi", "tipologia": "Masterclass", "concerti": 0, "masterclass": 3, "prezzo": 1200},
+    {"pacchetto": "5 Eventi", "tipologia": "Masterclass", "concerti": 0, "masterclass": 5, "prezzo": 2000},
+    {"pacchetto": "22 Eventi", "tipologia": "Combinato", "concerti": 12, "masterclass": 10, "prezzo": 5000},
+    {"pacchetto": "MAIN SPONSORSHIP", "tipologia": "Combinato", "concerti": 24, "masterclass": 10, "prezzo": 10000,
+     "esclusive": True},
+]
+
+
+def _growth(current, previous):
+    return round((current / previous - 1) * 100, 2) if previous else None
+
+
+def compute_kpis(df=df_historical, events=None):
+    """KPI dell'ultima edizione con la crescita percentuale sull'edizione precedente."""
+    last, previous = df.iloc[-1], df.iloc[-2]
+    kpis = {
+        "anno": int(last["Anno"]),
+        "pubblico": int(last["Pubblico in Presenza"]),
+        "copertura": int(last["Copertura Totale"]),
+        "copertura_facebook": int(last["Copertura Facebook"]),
+        "copertura_instagram": int(last["Copertura Instagram"]),
+        "eventi": int(last["Eventi Totali"]),
+        "comuni": int(last["Comuni Coinvolti"]),
+        "anno_confronto": int(previous["Anno"]),
+        "crescita_pct": {
+            "pubblico": _growth(last["Pubblico in Presenza"], previous["Pubblico in Presenza"]),
+            "copertura": _growth(last["Copertura Totale"], previous["Copertura Totale"]),
+            "eventi": _growth(last["Eventi Totali"], previous["Eventi Totali"]),
+            "comuni": _growth(last["Comuni Coinvolti"], previous["Comuni Coinvolti"]),
+        },
+    }
+    if events is not None:
+        # Ripartizione per tipologia dal dataset degli eventi dell'edizione
+        counts = events.loc[events["edizione"] == kpis["anno"], "tipo"].value_counts()
+        kpis["concerti"] = int(counts.get("concerto", 0))
+        kpis["masterclass"] = int(counts.get("masterclass", 0))
+    return kpis
@@ -0,0 +1,274 @@
+"""Cache su disco condivisa tra i processi Streamlit dello stesso server.
+
+Gli artefatti calcolati (layer della mappa, percorsi, simulazioni) stanno in
+un database SQLite in modalità WAL: i lettori non bloccano lo scrittore e
+ogni processo apre la propria connessione. Le chiavi sono hash del contenuto
+(funzione, argomenti, file di dati e sorgenti del pacchetto), quindi un nuovo
+deploy o nuovi dati non leggono mai artefatti vecchi. La dimensione totale è
+limitata con uno sfratto LRU, e un lease per chiave fa sì che solo il primo
+processo calcoli un artefatto mentre gli altri attendono il risultato.
+
+Configurazione da variabili d'ambiente:
+
+- ``FESTIVAL_CACHE_DIR``: cartella del database (default ``.cache``);
+- ``FESTIVAL_CACHE_MAX_MB``: dimensione massima (default 512);
+- ``FESTIVAL_DISK_CACHE=0``: disattiva la cache su disco.
+"""
+
+import functools
+import glob
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = ".cache"
+DEFAULT_MAX_MB = 512
+DB_NAME = "artifacts.sqlite"
+
+# Un calcolo che supera il lease viene considerato abbandonato e rifatto da un altro processo
+LEASE_SECONDS = 120
+# Aggiornare l'ultimo accesso a ogni lettura trasformerebbe ogni hit in una scrittura:
+# per l'LRU basta la precisione di qualche secondo
+ACCESS_RESOLUTION = 10
+POLL_MIN, POLL_MAX = 0.005, 0.2
+# Attesa massima del lock per le scritture, e per l'ora di accesso di una lettura (ms)
+BUSY_TIMEOUT = 30
+ACCESS_BUSY_TIMEOUT_MS = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_accessed ON artifacts (accessed);
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    expires REAL NOT NULL
+);
+"""
+
+# Elimina gli artefatti meno usati di recente oltre la dimensione massima
+_EVICT = """
+DELETE FROM artifacts WHERE key IN (
+    SELECT key FROM (
+        SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS running FROM artifacts
+    ) WHERE running > ?
+)
+"""
+
+
+class DiskCache:
+    """Cache chiave-valore (valori pickle) su SQLite, sicura tra processi e thread."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, lease_seconds=LEASE_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connection(self):
+        # Una connessione per thread e per processo: dopo un fork non si riusa quella del padre
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        """``(True, valore)`` se la chiave è presente, altrimenti ``(False, None)``."""
+        conn = self._connection()
+        row = conn.execute("SELECT value, accessed FROM artifacts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        now = time.time()
+        if now - row[1] > ACCESS_RESOLUTION:
+            # Una lettura non attende uno scrittore: se il lock non si libera subito
+            # l'ora di accesso si aggiornerà a una lettura successiva
+            conn.execute(f"PRAGMA busy_timeout = {ACCESS_BUSY_TIMEOUT_MS}")
+            try:
+                conn.execute("UPDATE artifacts SET accessed = ? WHERE key = ?", (now, key))
+            except sqlite3.OperationalError:
+                pass
+            finally:
+                conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT * 1000}")
+        return True, pickle.loads(row[0])
+
+    def set(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if len(blob) <= self.max_bytes:
+                conn.execute(
+                    "INSERT OR REPLACE INTO artifacts (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, blob, len(blob), time.time()),
+                )
+                conn.execute(_EVICT, (self.max_bytes,))
+            conn.execute("DELETE FROM leases WHERE key = ?", (key,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _acquire(self, key):
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM leases WHERE key = ? AND expires < ?", (key, now))
+            acquired = conn.execute(
+                "INSERT OR IGNORE INTO leases (key, expires) VALUES (?, ?)", (key, now + self.lease_seconds)
+            ).rowcount == 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return acquired
+
+    def _release(self, key):
+        self._connection().execute("DELETE FROM leases WHERE key = ?", (key,))
+
+    def get_or_compute(self, key, compute):
+        """Valore in cache, oppure calcolato da questo processo o da quello che ha il lease."""
+        delay = POLL_MIN
+        while True:
+            hit, value = self.get(key)
+            if hit:
+                return value
+            if self._acquire(key):
+                # Un altro processo può aver finito tra la lettura e il lease
+                hit, value = self.get(key)
+                if hit:
+                    self._release(key)
+                    return value
+                break
+            # Un altro processo sta calcolando lo stesso artefatto: si attende il risultato
+            time.sleep(delay)
+            delay = min(delay * 2, POLL_MAX)
+        try:
+            value = compute()
+        except BaseException:
+            self._release(key)
+            raise
+        try:
+            self.set(key, value)
+        except sqlite3.Error as e:
+            # Il valore è comunque valido. Il rollback ha annullato anche il rilascio del lease:
+            # lo si rilascia qui, se possibile, perché chi attende lo calcoli subito invece
+            # di aspettarne la scadenza
+            logger.warning("Scrittura in cache non riuscita (%s)", e)
+            try:
+                self._release(key)
+            except sqlite3.Error:
+                pass
+        return value
+
+    def info(self):
+        entries, size = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+        return {"artefatti": entries, "byte": size, "max_byte": self.max_bytes}
+
+    def clear(self):
+        conn = self._connection()
+        conn.execute("DELETE FROM artifacts")
+        conn.execute("DELETE FROM leases")
+
+
+def _package_digest():
+    # Ogni modifica ai sorgenti del pacchetto invalida tutti gli artefatti
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+CODE_DIGEST = _package_digest()
+
+
+@functools.lru_cache(maxsize=64)
+def _file_digest(path, mtime_ns, size):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def file_digest(path):
+    """Hash del contenuto di un file di dati, ricalcolato solo se il file cambia."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return _file_digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _plain(value):
+    # Un np.int64(2025) da un selectbox e l'intero 2025 devono dare la stessa chiave
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def content_key(*parts):
+    return hashlib.sha256(pickle.dumps((CODE_DIGEST, parts), protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+def cache_directory():
+    return os.environ.get("FESTIVAL_CACHE_DIR", DEFAULT_DIR)
+
+
+def enabled():
+    return os.environ.get("FESTIVAL_DISK_CACHE", "1") != "0"
+
+
+@functools.lru_cache(maxsize=None)
+def default_cache():
+    """Cache configurata dall'ambiente, o ``None`` se disattivata o non utilizzabile."""
+    if not enabled():
+        return None
+    directory = cache_directory()
+    max_bytes = int(float(os.environ.get("FESTIVAL_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+    try:
+        return DiskCache(os.path.join(directory, DB_NAME), max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Cache su disco non disponibile (%s): si calcola in ogni processo", e)
+        return None
+
+
+def disk_cached(namespace, depends=()):
+    """Decoratore: risultato condiviso tra processi, con chiave dagli argomenti e dai file ``depends``."""
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = default_cache()
+            if cache is None:
+                return fn(*args, **kwargs)
+            # Argomenti per nome e con i default: f(1, b=2) e f(a=1) danno la stessa chiave
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = content_key(
+                namespace,
+                [file_digest(p) for p in depends],
+                sorted((k, _plain(v)) for k, v in bound.arguments.items()),
+            )
+            try:
+                return cache.get_or_compute(key, lambda: fn(*args, **kwargs))
+            except sqlite3.Error as e:
+                logger.warning("Cache su disco non disponibile (%s): calcolo locale di %s", e, namespace)
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
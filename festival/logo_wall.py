@@ -0,0 +1,240 @@
+"""Muro dei loghi degli sponsor, per livello, da atlanti di immagini.
+
+Gli sponsor sono elencati in ``data/sponsor.csv`` (nome, livello, file del
+logo, sito). Ogni logo viene normalizzato una volta: bordi uniformi
+rimossi e ridimensionato nella cella del suo livello, al doppio della misura
+mostrata per gli schermi ad alta densità. Le celle di un livello si
+compongono in un unico atlante WebP servito come file statico da
+Streamlit, quindi centinaia di loghi costano una richiesta per livello
+invece di una per logo. Nella pagina ogni logo è una finestra sull'atlante;
+i livelli sotto la piega si caricano solo quando la pagina ci arriva
+(``loading="lazy"``).
+
+La ricostruzione è incrementale: le celle normalizzate sono in cache per
+contenuto del logo e misura, e un atlante prende il nome dall'hash delle
+sue celle, quindi si ricompone solo il livello in cui un logo è stato
+aggiunto o cambiato. Nomi immutabili permettono al browser di tenere gli
+atlanti in cache. Ogni processo Streamlit (e il riscaldamento) può
+ricostruire: file scritti con ``os.replace`` e pulizie che tollerano file già
+rimossi da un altro processo. Le celle dei loghi non più nel registro si
+eliminano a ogni costruzione, perché stanno fuori dalla cache limitata in
+dimensione.
+
+Uso::
+
+    python -m festival.logo_wall
+"""
+
+import argparse
+import hashlib
+import html
+import os
+import re
+import time
+
+import pandas as pd
+from PIL import Image, ImageChops, ImageOps
+
+from festival import disk_cache
+
+# --- PERCORSI E PARAMETRI ---
+REGISTRY_PATH = os.path.join("data", "sponsor.csv")
+# Cartella servita da Streamlit come /app/static (server.enableStaticServing)
+STATIC_DIR = "static"
+ATLAS_DIR = os.path.join(STATIC_DIR, "loghi")
+STATIC_URL = "app/static/loghi"
+
+# Livelli dal più alto al più basso: titolo e cella mostrata (px CSS)
+TIERS = {
+    "main": ("Main Sponsors", (240, 120)),
+    "partner": ("Partner", (160, 80)),
+    "sostenitore": ("Sostenitori", (112, 56)),
+}
+# I livelli dopo il primo sono sotto la piega e si caricano solo quando servono
+EAGER_TIERS = 1
+# Pixel dell'atlante per pixel CSS
+DENSITY = 2
+ATLAS_COLUMNS = 8
+PADDING = 0.08
+# Differenza dal colore dell'angolo oltre la quale un pixel fa parte del logo
+TRIM_TOLERANCE = 16
+WEBP_QUALITY = 90
+# Cambia quando cambia la normalizzazione, per rigenerare le celle già in cache
+CELL_VERSION = 1
+# File temporanei (nome che finisce con ".<pid>") più vecchi di così sono di uno
+# scrittore interrotto e si eliminano
+TEMP_MAX_AGE = 600
+_TEMP = re.compile(r"\.\d+$")
+
+
+def load_registry(path=REGISTRY_PATH):
+    """Registro degli sponsor nell'ordine del file; le righe ``#`` in testa sono note."""
+    registry = pd.read_csv(path, comment="#", dtype=str, keep_default_na=False)
+    unknown = set(registry["livello"]) - set(TIERS)
+    if unknown:
+        raise ValueError(f"Livelli sconosciuti in {path}: {', '.join(sorted(unknown))}")
+    return registry
+
+
+def _trim(image):
+    # Bordi trasparenti, o dello stesso colore dell'angolo per i loghi su fondo pieno
+    alpha = image.getchannel("A")
+    if alpha.getpixel((0, 0)) == 0:
+        return image.crop(alpha.getbbox() or (0, 0) + image.size)
+    background = Image.new("RGB", image.size, image.getpixel((0, 0))[:3])
+    diff = ImageChops.difference(image.convert("RGB"), background).convert("L")
+    box = diff.point(lambda v: 255 if v > TRIM_TOLERANCE else 0).getbbox()
+    return image.crop(box) if box else image
+
+
+def normalize(path, size):
+    """Logo ritagliato e centrato in una cella trasparente ``size`` (pixel dell'atlante)."""
+    with Image.open(path) as source:
+        image = _trim(ImageOps.exif_transpose(source).convert("RGBA"))
+    width, height = size
+    pad = int(min(size) * PADDING)
+    image.thumbnail((width - 2 * pad, height - 2 * pad), Image.LANCZOS)
+    cell = Image.new("RGBA", size, (0, 0, 0, 0))
+    cell.paste(image, ((width - image.width) // 2, (height - image.height) // 2), image)
+    return cell
+
+
+def _cell_dir():
+    return os.path.join(disk_cache.cache_directory(), "loghi")
+
+
+def _remove_others(directory, keep, prefix="", suffix=""):
+    # Un altro processo può aver già rimosso lo stesso file
+    now = time.time()
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if _TEMP.search(name):
+                if now - os.path.getmtime(path) > TEMP_MAX_AGE:
+                    os.remove(path)
+            elif name.startswith(prefix) and name.endswith(suffix) and name not in keep:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _cell_key(path, size):
+    # Dal contenuto del logo, senza aprire l'immagine
+    return hashlib.sha256(f"{disk_cache.file_digest(path)}:{size}:{CELL_VERSION}".encode()).hexdigest()[:20]
+
+
+def _cell(path, size, key):
+    """Cella normalizzata in cache su disco per contenuto del logo e misura."""
+    cell_path = os.path.join(_cell_dir(), f"{key}.png")
+    try:
+        # Letta subito: centinaia di celle non tengono aperti centinaia di file, e una
+        # cella appena eliminata da un altro processo si rigenera
+        with Image.open(cell_path) as cell:
+            cell.load()
+        return cell, False
+    except FileNotFoundError:
+        pass
+    cell = normalize(path, size)
+    os.makedirs(os.path.dirname(cell_path), exist_ok=True)
+    tmp = f"{cell_path}.{os.getpid()}"
+    cell.save(tmp, format="PNG")
+    os.replace(tmp, cell_path)
+    return cell, True
+
+
+def build(registry=None, atlas_dir=ATLAS_DIR):
+    """Aggiorna gli atlanti dei livelli cambiati; restituisce il manifesto per :func:`wall_html`.
+
+    Il manifesto riporta anche quante celle e quanti atlanti sono stati
+    rigenerati e i loghi mancanti. Il nome di un atlante dipende solo dal
+    contenuto dei loghi: le immagini si aprono solo se va ricomposto.
+    """
+    registry = load_registry() if registry is None else registry
+    os.makedirs(atlas_dir, exist_ok=True)
+    manifest = {"livelli": {}, "mancanti": [], "celle_nuove": 0, "atlanti_nuovi": 0}
+    used = set()
+    for tier, (title, (width, height)) in TIERS.items():
+        size = (width * DENSITY, height * DENSITY)
+        entries, logos = [], []
+        for sponsor in registry[registry["livello"] == tier].itertuples():
+            if not os.path.exists(sponsor.logo):
+                manifest["mancanti"].append(sponsor.nome)
+                continue
+            key = _cell_key(sponsor.logo, size)
+            used.add(f"{key}.png")
+            logos.append((sponsor.logo, key))
+            entries.append({"nome": sponsor.nome, "sito": sponsor.sito})
+        if not logos:
+            continue
+
+        digest = hashlib.sha256("".join(key for _, key in logos).encode()).hexdigest()[:12]
+        name = f"{tier}-{digest}.webp"
+        columns = min(ATLAS_COLUMNS, len(logos))
+        if not os.path.exists(os.path.join(atlas_dir, name)):
+            rows = -(-len(logos) // columns)
+            atlas = Image.new("RGBA", (columns * size[0], rows * size[1]), (0, 0, 0, 0))
+            for i, (logo, key) in enumerate(logos):
+                cell, fresh = _cell(logo, size, key)
+                manifest["celle_nuove"] += fresh
+                atlas.paste(cell, ((i % columns) * size[0], (i // columns) * size[1]))
+            tmp = os.path.join(atlas_dir, f".{name}.{os.getpid()}")
+            atlas.save(tmp, format="WEBP", quality=WEBP_QUALITY)
+            os.replace(tmp, os.path.join(atlas_dir, name))
+            manifest["atlanti_nuovi"] += 1
+        manifest["livelli"][tier] = {
+            "titolo": title, "atlante": name, "cella": [width, height], "colonne": columns, "loghi": entries,
+        }
+
+    # Atlanti precedenti o di livelli rimasti vuoti, celle di loghi tolti o cambiati
+    # e file temporanei di scrittori interrotti
+    _remove_others(atlas_dir, {level["atlante"] for level in manifest["livelli"].values()}, suffix=".webp")
+    if os.path.isdir(_cell_dir()):
+        _remove_others(_cell_dir(), used, suffix=".png")
+    return manifest
+
+
+def fingerprint(registry_path=REGISTRY_PATH):
+    """Hash del registro e dei file dei loghi: cambia solo se un logo è aggiunto o modificato."""
+    registry = load_registry(registry_path)
+    return disk_cache.file_digest(registry_path), tuple(disk_cache.file_digest(p) for p in registry["logo"])
+
+
+def wall_html(manifest, base_url=STATIC_URL):
+    """HTML del muro: per ogni livello un titolo e i loghi come finestre sul suo atlante."""
+    parts = []
+    for i, (tier, level) in enumerate(manifest["livelli"].items()):
+        width, height = level["cella"]
+        columns = level["colonne"]
+        src = f"{base_url}/{level['atlante']}"
+        loading = "eager" if i < EAGER_TIERS else "lazy"
+        tiles = []
+        for j, logo in enumerate(level["loghi"]):
+            x, y = (j % columns) * width, (j // columns) * height
+            name = html.escape(logo["nome"])
+            image = (f'<img src="{src}" alt="{name}" loading="{loading}" decoding="async" '
+                     f'style="left:-{x}px;top:-{y}px">')
+            if logo["sito"]:
+                image = f'<a href="{html.escape(logo["sito"])}" target="_blank" rel="noopener">{image}</a>'
+            tiles.append(f'<div class="logo-tile" title="{name}">{image}</div>')
+        parts.append(
+            f'<div class="logo-tier logo-tier-{tier}"><h4>{html.escape(level["titolo"])}</h4>'
+            f'<div class="logo-wall" style="--cella-w:{width}px;--cella-h:{height}px;--atlante-w:{columns * width}px">'
+            + "".join(tiles) + "</div></div>"
+        )
+    return "".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+    start = time.perf_counter()
+    manifest = build()
+    logos = sum(len(level["loghi"]) for level in manifest["livelli"].values())
+    print(f"{logos} loghi in {len(manifest['livelli'])} livelli: {manifest['celle_nuove']} celle e "
+          f"{manifest['atlanti_nuovi']} atlanti rigenerati in {(time.perf_counter() - start) * 1000:.0f} ms")
+    if manifest["mancanti"]:
+        print("Loghi mancanti: " + ", ".join(manifest["mancanti"]))
+
+
+if __name__ == "__main__":
+    main()
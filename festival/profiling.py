@@ -0,0 +1,297 @@
+"""Profilazione opzionale delle esecuzioni dello script, per sviluppo e staging.
+
+Si attiva con ``FESTIVAL_PROFILE=1``, mai con ``FESTIVAL_ENV=production``;
+``?profile=1`` nell'URL vale solo con ``FESTIVAL_ENV=development``, così un
+visitatore dell'app pubblicata non può avviarla. Un thread campiona lo stack
+del thread dello script ogni pochi millisecondi finché l'esecuzione non
+termina (anche per un ``st.rerun``); ogni campione è attribuito alla sezione dello script e della
+pagina in cui si trova, secondo i commenti ``# --- SEZIONE ---`` del sorgente.
+Per ogni esecuzione si scrivono in ``.profiles/`` (ultime
+``FESTIVAL_PROFILE_KEEP``) gli stack compressi per i flame graph, un
+riepilogo ad albero, le funzioni più costose e i tempi per sezione.
+
+Uso::
+
+    python -m festival.profiling list
+    python -m festival.profiling report [ESECUZIONE]
+    python -m festival.profiling compare A B
+"""
+
+import argparse
+import bisect
+import collections
+import functools
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+
+PROFILE_DIR = os.environ.get("FESTIVAL_PROFILE_DIR", ".profiles")
+KEEP = int(os.environ.get("FESTIVAL_PROFILE_KEEP", 30))
+INTERVAL = float(os.environ.get("FESTIVAL_PROFILE_INTERVAL_MS", 2)) / 1000
+TOP_N = 20
+# Un'esecuzione bloccata non deve lasciare il campionatore attivo per sempre
+MAX_SECONDS = 300
+# Rami del riepilogo ad albero sotto questa quota del tempo totale vengono omessi
+FLAME_MIN_SHARE = 0.01
+
+_SECTION = re.compile(r"^\s*# --- (.+?) ---")
+_OUTSIDE = "(fuori sezione)"
+
+
+def enabled(query_params=None):
+    """Vero se la profilazione è richiesta e l'ambiente non è di produzione.
+
+    Il parametro ``profile`` dell'URL conta solo in un ambiente dichiarato di sviluppo.
+    """
+    environment = os.environ.get("FESTIVAL_ENV", "").lower()
+    if environment == "production":
+        return False
+    if os.environ.get("FESTIVAL_PROFILE") == "1":
+        return True
+    return environment == "development" and query_params is not None and query_params.get("profile") == "1"
+
+
+@functools.lru_cache(maxsize=64)
+def _sections(filename):
+    """Righe di inizio e nomi delle sezioni ``# --- NOME ---`` di un sorgente."""
+    try:
+        with open(filename, encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return [], []
+    found = [(i + 1, m.group(1).strip()) for i, line in enumerate(lines) if (m := _SECTION.match(line))]
+    return [line for line, _ in found], [name for _, name in found]
+
+
+def _section_at(filename, line):
+    starts, names = _sections(filename)
+    i = bisect.bisect_right(starts, line) - 1
+    return names[i] if i >= 0 else _OUTSIDE
+
+
+def _short(filename):
+    if "site-packages" in filename:
+        return filename.split("site-packages" + os.sep, 1)[1]
+    try:
+        return os.path.relpath(filename)
+    except ValueError:
+        return filename
+
+
+def _label(code):
+    return f"{code.co_name} ({_short(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Sampler(threading.Thread):
+    """Campiona lo stack del thread dello script finché il frame radice è attivo."""
+
+    def __init__(self, root, thread_id, label, section_files):
+        super().__init__(name="festival-profiler", daemon=True)
+        self.root = root
+        self.thread_id = thread_id
+        self.label = label
+        self.section_files = section_files
+        self.stacks = collections.Counter()
+        self.sections = collections.Counter()
+        self.self_ms = collections.Counter()
+        self.total_ms = collections.Counter()
+        self.samples = 0
+
+    def run(self):
+        start = last = time.perf_counter()
+        started_at = time.time()
+        while time.perf_counter() - start < MAX_SECONDS:
+            time.sleep(INTERVAL)
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None or not self._record(frame, (now - last) * 1000):
+                break
+            last = now
+        self._write(started_at, (time.perf_counter() - start) * 1000)
+
+    def _record(self, frame, elapsed_ms):
+        stack = []
+        sections = []
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            # Le sezioni sono quelle del codice di modulo (script e pagine): una funzione
+            # definita in una sezione e chiamata da un'altra conta per chi la chiama
+            if frame is self.root or (filename in self.section_files and frame.f_code.co_name == "<module>"):
+                sections.append(_section_at(filename, frame.f_lineno))
+            stack.append(frame.f_code)
+            if frame is self.root:
+                break
+            frame = frame.f_back
+        else:
+            # Il frame dello script non è più sullo stack: l'esecuzione è finita
+            return False
+        section = " > ".join(reversed(sections))
+        labels = [_label(code) for code in reversed(stack)]
+        self.samples += 1
+        self.sections[section] += elapsed_ms
+        self.stacks[";".join([section] + labels)] += 1
+        self.self_ms[labels[-1]] += elapsed_ms
+        for name in set(labels):
+            self.total_ms[name] += elapsed_ms
+        return True
+
+    def _write(self, started_at, wall_ms):
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started_at)) + f"-{int(started_at * 1000) % 1000:03d}"
+        directory = os.path.join(PROFILE_DIR, f"{stamp}-{re.sub(r'[^A-Za-z0-9_-]', '_', self.label)}")
+        os.makedirs(directory, exist_ok=True)
+        meta = {
+            "etichetta": self.label,
+            "inizio": started_at,
+            "durata_ms": round(wall_ms, 2),
+            "campioni": self.samples,
+            "intervallo_ms": INTERVAL * 1000,
+            "sezioni_ms": {k: round(v, 2) for k, v in self.sections.most_common()},
+            "funzioni_self_ms": {k: round(v, 2) for k, v in self.self_ms.most_common(200)},
+            "funzioni_totale_ms": {k: round(v, 2) for k, v in self.total_ms.most_common(200)},
+        }
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        # Formato "collapsed" di flamegraph.pl e speedscope: stack separati da ';' e conteggio
+        with open(os.path.join(directory, "stacks.txt"), "w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        with open(os.path.join(directory, "report.txt"), "w", encoding="utf-8") as f:
+            f.write(format_report(meta, self.stacks))
+        _prune()
+
+
+def _prune(keep=None):
+    keep = KEEP if keep is None else keep
+    runs = list_runs()
+    for name in runs[:-keep] if keep > 0 else runs:
+        shutil.rmtree(os.path.join(PROFILE_DIR, name), ignore_errors=True)
+
+
+def start_run(label, section_files=()):
+    """Avvia il campionamento dell'esecuzione corrente dello script chiamante.
+
+    ``section_files`` sono gli altri sorgenti (le pagine) le cui sezioni
+    vanno riportate; il file chiamante è sempre incluso. Il campionatore si
+    ferma e salva il profilo da solo quando lo script termina; la sua ``label``
+    si può cambiare fino ad allora.
+    """
+    root = sys._getframe(1)
+    files = {root.f_code.co_filename} | {os.path.abspath(p) for p in section_files}
+    sampler = _Sampler(root, threading.get_ident(), label, frozenset(files))
+    sampler.start()
+    return sampler
+
+
+def flame_summary(stacks, min_share=FLAME_MIN_SHARE):
+    """Albero indentato degli stack con la quota di campioni di ogni ramo."""
+    tree = {}
+    total = sum(stacks.values())
+    for stack, count in stacks.items():
+        node = tree
+        for frame in stack.split(";"):
+            entry = node.setdefault(frame, [0, {}])
+            entry[0] += count
+            node = entry[1]
+
+    lines = []
+
+    def walk(node, depth):
+        for frame, (count, children) in sorted(node.items(), key=lambda item: -item[1][0]):
+            if count / total < min_share:
+                continue
+            lines.append(f"{count / total:6.1%} {'  ' * depth}{frame}")
+            walk(children, depth + 1)
+
+    if total:
+        walk(tree, 0)
+    return "\n".join(lines)
+
+
+def format_report(meta, stacks=None, top=TOP_N):
+    lines = [
+        f"Esecuzione: {meta['etichetta']}",
+        f"Durata: {meta['durata_ms']:.0f} ms, {meta['campioni']} campioni ogni {meta['intervallo_ms']:.1f} ms",
+        "",
+        "Tempo per sezione:",
+    ]
+    lines += [f"{ms:>10.1f} ms  {name}" for name, ms in meta["sezioni_ms"].items()]
+    lines += ["", f"Prime {top} funzioni per tempo proprio:"]
+    lines += [f"{ms:>10.1f} ms  {name}" for name, ms in list(meta["funzioni_self_ms"].items())[:top]]
+    lines += ["", f"Prime {top} funzioni per tempo totale (incluse le chiamate):"]
+    lines += [f"{ms:>10.1f} ms  {name}" for name, ms in list(meta["funzioni_totale_ms"].items())[:top]]
+    if stacks is not None:
+        lines += ["", "Flame graph (quota dei campioni):", flame_summary(stacks)]
+    return "\n".join(lines) + "\n"
+
+
+def list_runs():
+    """Esecuzioni salvate, dalla più vecchia alla più recente."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    return sorted(d for d in os.listdir(PROFILE_DIR) if os.path.exists(os.path.join(PROFILE_DIR, d, "meta.json")))
+
+
+def _resolve(run):
+    # Un indice (-1 è l'ultima esecuzione) o il nome della cartella
+    runs = list_runs()
+    try:
+        return runs[int(run)]
+    except (ValueError, IndexError):
+        return os.path.basename(os.path.normpath(run))
+
+
+def load_run(run):
+    with open(os.path.join(PROFILE_DIR, _resolve(run), "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(a, b, top=TOP_N):
+    """Differenze per sezione e per funzione tra due esecuzioni (B - A)."""
+    meta_a, meta_b = load_run(a), load_run(b)
+    lines = [
+        f"A: {meta_a['etichetta']} {meta_a['durata_ms']:.0f} ms    B: {meta_b['etichetta']} {meta_b['durata_ms']:.0f} ms"
+        f"    differenza {meta_b['durata_ms'] - meta_a['durata_ms']:+.0f} ms",
+        "",
+        f"{'A ms':>10}{'B ms':>10}{'B - A':>10}  sezione",
+    ]
+
+    def rows(key):
+        names = set(meta_a[key]) | set(meta_b[key])
+        deltas = {n: meta_b[key].get(n, 0) - meta_a[key].get(n, 0) for n in names}
+        for name in sorted(names, key=lambda n: -abs(deltas[n]))[:top]:
+            yield f"{meta_a[key].get(name, 0):>10.1f}{meta_b[key].get(name, 0):>10.1f}{deltas[name]:>+10.1f}  {name}"
+
+    lines += rows("sezioni_ms")
+    lines += ["", f"{'A ms':>10}{'B ms':>10}{'B - A':>10}  funzione (tempo proprio)"]
+    lines += rows("funzioni_self_ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="elenca le esecuzioni salvate")
+    report = commands.add_parser("report", help="riepilogo di un'esecuzione")
+    report.add_argument("run", nargs="?", default="-1", help="cartella o indice (default: l'ultima)")
+    diff = commands.add_parser("compare", help="confronta due esecuzioni")
+    diff.add_argument("a")
+    diff.add_argument("b")
+    diff.add_argument("--top", type=int, default=TOP_N)
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for i, name in enumerate(list_runs()):
+            meta = load_run(name)
+            print(f"{i:>4}  {name}  {meta['durata_ms']:>8.0f} ms")
+    elif args.command == "report":
+        with open(os.path.join(PROFILE_DIR, _resolve(args.run), "report.txt"), encoding="utf-8") as f:
+            print(f.read(), end="")
+    else:
+        print(compare(args.a, args.b, args.top))
+
+
+if __name__ == "__main__":
+    main()
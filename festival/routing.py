@@ -0,0 +1,166 @@
+"""Matrice delle distanze tra le sedi e ordine di visita per musicisti, staff e stand.
+
+La matrice haversine si calcola con un solo broadcast NumPy; l'ordine di
+visita parte dal vicino più prossimo e viene migliorato con 2-opt e Or-opt,
+valutando ogni mossa su tutte le posizioni possibili in un'unica operazione
+vettoriale. I percorsi sono in cache per insieme di sedi.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from festival.data import locations_2025, locations_potential
+from festival.geo import haversine_km
+
+# Le strade del Salento allungano la distanza in linea d'aria di circa un terzo;
+# la velocità media tiene conto di centri abitati e strade provinciali
+DETOUR_FACTOR = 1.3
+AVG_SPEED_KMH = 50
+
+# Lunghezze dei segmenti spostati da Or-opt
+OR_OPT_LENGTHS = (1, 2, 3)
+
+_EPS = 1e-9
+
+
+def distance_matrix(coords):
+    """Distanze in linea d'aria (km) tra tutte le coppie di coordinate ``[lat, lon]``."""
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    lat, lon = coords[:, 0], coords[:, 1]
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+def travel_minutes(distances):
+    """Tempi di percorrenza stimati (minuti) dalle distanze in linea d'aria."""
+    return distances * DETOUR_FACTOR / AVG_SPEED_KMH * 60
+
+
+def _extended(dist, start, closed):
+    """Matrice con un nodo di coda in fondo al percorso.
+
+    Il percorso è sempre ``start -> ... -> coda``: per un giro chiuso la coda
+    è una copia della partenza, per un percorso aperto è un nodo fittizio a
+    distanza zero da tutti, così l'ultima tappa resta libera.
+    """
+    n = len(dist)
+    ext = np.zeros((n + 1, n + 1))
+    ext[:n, :n] = dist
+    if closed:
+        ext[n, :n] = dist[start]
+        ext[:n, n] = dist[:, start]
+    return ext
+
+
+def _nearest_neighbour(dist, start):
+    n = len(dist)
+    tour = [start]
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[tour[-1]])
+        nxt = int(np.argmin(row))
+        tour.append(nxt)
+        visited[nxt] = True
+    return tour
+
+
+def _two_opt(tour, d):
+    """Una passata di 2-opt: per ogni arco la migliore inversione, valutata su tutti gli altri."""
+    improved = False
+    last = len(tour) - 1
+    for i in range(last - 2):
+        a, b = tour[i], tour[i + 1]
+        c, e = tour[i + 2:last], tour[i + 3:last + 1]
+        delta = d[a, c] + d[b, e] - d[a, b] - d[c, e]
+        k = int(np.argmin(delta))
+        if delta[k] < -_EPS:
+            j = i + 2 + k
+            tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+            improved = True
+    return improved
+
+
+def _or_opt(tour, d):
+    """Una passata di Or-opt: sposta segmenti di 1-3 tappe nella posizione più conveniente."""
+    improved = False
+    for length in OR_OPT_LENGTHS:
+        i = 1
+        while i + length < len(tour):
+            seg = tour[i:i + length]
+            p, q = tour[i - 1], tour[i + length]
+            first, lastnode = seg[0], seg[-1]
+            gain = d[p, first] + d[lastnode, q] - d[p, q]
+            # Percorso senza il segmento: ogni arco (u, v) è un possibile punto di inserimento
+            rest = np.concatenate([tour[:i], tour[i + length:]])
+            u, v = rest[:-1], rest[1:]
+            forward = d[u, first] + d[lastnode, v] - d[u, v]
+            backward = d[u, lastnode] + d[first, v] - d[u, v]
+            cost = np.minimum(forward, backward)
+            # Reinserire il segmento dov'era non è una mossa
+            cost[i - 1] = np.inf
+            k = int(np.argmin(cost))
+            if cost[k] < gain - _EPS:
+                if backward[k] < forward[k]:
+                    seg = seg[::-1]
+                tour[:] = np.concatenate([rest[:k + 1], seg, rest[k + 1:]])
+                improved = True
+            else:
+                i += 1
+    return improved
+
+
+def solve_order(dist, start=0, closed=True, max_rounds=100):
+    """Ordine di visita (indici) che parte da ``start``; ``closed`` torna alla partenza."""
+    n = len(dist)
+    if n <= 2:
+        return [start] + [i for i in range(n) if i != start]
+    d = _extended(np.asarray(dist, dtype=float), start, closed)
+    tour = np.array(_nearest_neighbour(dist, start) + [n])
+    for _ in range(max_rounds):
+        # Si alternano le due mosse finché nessuna delle due migliora il percorso
+        if not (_two_opt(tour, d) | _or_opt(tour, d)):
+            break
+    return tour[:-1].tolist()
+
+
+def route_length(dist, order, closed=True):
+    legs = [dist[a, b] for a, b in zip(order[:-1], order[1:])]
+    if closed and len(order) > 1:
+        legs.append(dist[order[-1], order[0]])
+    return float(sum(legs))
+
+
+@lru_cache(maxsize=128)
+def _plan(venues, start, closed):
+    names = [name for name, _, _ in venues]
+    dist = distance_matrix([(lat, lon) for _, lat, lon in venues])
+    order = solve_order(dist, names.index(start), closed)
+    km = route_length(dist, order, closed) * DETOUR_FACTOR
+    return {
+        "tappe": [names[i] for i in order] + ([start] if closed else []),
+        "coordinate": [venues[i][1:] for i in order] + ([venues[order[0]][1:]] if closed else []),
+        "km": round(km, 1),
+        "minuti": round(km / AVG_SPEED_KMH * 60),
+    }
+
+
+def plan_route(venues, start=None, closed=True):
+    """Percorso tra le sedi ``{nome: [lat, lon]}``, in cache per insieme di sedi.
+
+    Restituisce le tappe in ordine, le loro coordinate, i km stimati su strada
+    e i minuti di guida.
+    """
+    key = tuple(sorted((name, float(lat), float(lon)) for name, (lat, lon) in venues.items()))
+    start = start if start is not None else key[0][0]
+    return _plan(key, start, closed)
+
+
+def plan_schedule_route(events, closed=True, locations=None):
+    """Percorso tra i comuni di un insieme di eventi, in partenza dal comune del primo evento."""
+    locations = locations if locations is not None else {**locations_2025, **locations_potential}
+    events = events.sort_values("inizio")
+    comuni = [c for c in dict.fromkeys(events["comune"]) if c in locations]
+    if not comuni:
+        return None
+    return plan_route({c: locations[c] for c in comuni}, start=comuni[0], closed=closed)
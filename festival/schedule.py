@@ -0,0 +1,113 @@
+"""Calendario degli eventi con un indice a intervalli.
+
+Gli eventi sono ordinati per inizio e accompagnati dal massimo progressivo
+delle ore di fine, che è monotono: due ``searchsorted`` delimitano così gli
+unici eventi che possono sovrapporsi a un intervallo, e il filtro finale è
+vettoriale. Le query ("eventi di oggi", "prossimi eventi vicini", "conflitti
+di sede") restano sotto il millisecondo anche su archivi multi-edizione con
+migliaia di eventi.
+"""
+
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from festival.data import locations_2025, locations_potential
+from festival.geo import haversine_km
+
+
+def _seconds(t):
+    """Istante (stringa, datetime o Timestamp) in secondi epoch, come gli indici."""
+    return int(pd.Timestamp(t).to_datetime64().astype("datetime64[s]").astype(np.int64))
+
+
+class Schedule:
+    """Eventi con inizio, fine, comune, sede e tipo, indicizzati per intervallo."""
+
+    def __init__(self, events, locations=None):
+        locations = locations if locations is not None else {**locations_2025, **locations_potential}
+        self.events = events.sort_values("inizio", kind="stable").reset_index(drop=True)
+        self.start = self.events["inizio"].to_numpy("datetime64[s]").astype(np.int64)
+        self.end = self.events["fine"].to_numpy("datetime64[s]").astype(np.int64)
+        # Il massimo progressivo delle fine è monotono: si può cercare con searchsorted
+        self.max_end = np.maximum.accumulate(self.end) if len(self.end) else self.end
+
+        # Una sede è identificata da comune e nome della sede
+        venue_keys = pd.MultiIndex.from_frame(self.events[["comune", "sede"]])
+        self.venue_codes, self.venues = pd.factorize(venue_keys)
+        coords = np.array([locations.get(comune, (np.nan, np.nan)) for comune, _ in self.venues], dtype=float)
+        self.venue_lat, self.venue_lon = coords.reshape(-1, 2).T
+        self._by_comune = self.events.groupby("comune").indices
+
+    def __len__(self):
+        return len(self.events)
+
+    def _overlapping(self, t0, t1):
+        """Posizioni degli eventi che si sovrappongono a ``[t0, t1)``."""
+        # Solo gli eventi iniziati prima di t1 ...
+        hi = np.searchsorted(self.start, t1, side="left")
+        # ... a partire dal primo dopo il quale qualche evento finisce oltre t0
+        lo = np.searchsorted(self.max_end, t0, side="right")
+        if lo >= hi:
+            return np.empty(0, dtype=np.intp)
+        return lo + np.flatnonzero(self.end[lo:hi] > t0)
+
+    def between(self, start, end):
+        """Eventi in corso tra ``start`` e ``end``."""
+        return self.events.iloc[self._overlapping(_seconds(start), _seconds(end))]
+
+    def on_day(self, day):
+        """Eventi del giorno ``day``."""
+        day = pd.Timestamp(day).normalize()
+        return self.between(day, day + pd.Timedelta(days=1))
+
+    def upcoming_near(self, lat, lon, now, radius_km=20, limit=5):
+        """Prossimi ``limit`` eventi non ancora finiti entro ``radius_km`` dal punto dato."""
+        t = _seconds(now)
+        # Le distanze si calcolano una volta per sede, non per evento
+        near = haversine_km(lat, lon, self.venue_lat, self.venue_lon) <= radius_km
+        lo = np.searchsorted(self.max_end, t, side="right")
+        candidates = lo + np.flatnonzero((self.end[lo:] > t) & near[self.venue_codes[lo:]])
+        picked = candidates[:limit]
+        result = self.events.iloc[picked].copy()
+        codes = self.venue_codes[picked]
+        result["distanza_km"] = haversine_km(lat, lon, self.venue_lat[codes], self.venue_lon[codes]).round(1)
+        return result
+
+    def conflicts(self):
+        """Eventi sovrapposti a un evento precedente nella stessa sede.
+
+        Restituisce le coppie come DataFrame con le colonne dell'evento e
+        ``in_conflitto_con``, la posizione in ``events`` dell'evento
+        precedente che finisce più tardi.
+        """
+        rows, other = self._conflict_pairs
+        result = self.events.iloc[rows].copy()
+        result["in_conflitto_con"] = other
+        return result
+
+    @cached_property
+    def _conflict_pairs(self):
+        # Il calendario è immutabile: le coppie si calcolano una volta sola
+        if len(self) < 2:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        order = np.lexsort((self.start, self.venue_codes))
+        venue = self.venue_codes[order]
+        start = self.start[order] - self.start.min()
+        end = self.end[order] - self.start.min()
+        # Massimo progressivo delle fine che riparte a ogni sede: ogni sede è spostata
+        # oltre la precedente e la posizione dell'evento è codificata nelle cifre basse
+        span = int(end.max()) + 1
+        n = len(order)
+        key = ((venue.astype(np.int64) * span + end) * n) + np.arange(n)
+        running = np.maximum.accumulate(key)
+        prev = running[:-1]
+        prev_pos = prev % n
+        prev_end = (prev // n) - venue[1:].astype(np.int64) * span
+        clash = (venue[1:] == venue[prev_pos]) & (start[1:] < prev_end)
+        return order[1:][clash], order[prev_pos[clash]]
+
+    def for_comune(self, comune):
+        """Eventi di un comune, in ordine di inizio."""
+        return self.events.iloc[self._by_comune.get(comune, [])]
@@ -0,0 +1,266 @@
+"""Card per i social e immagini Open Graph con i KPI del festival.
+
+Le card si compongono con Pillow dagli stessi dati e loghi dell'app (i main
+sponsor del registro ``data/sponsor.csv``), nei formati 1:1 e 4:5 (feed), 9:16 (storie) e 1.91:1 (Open Graph e link). Ogni
+card è in cache per hash del contenuto (testi, formato, file dei loghi e
+sorgenti) nella cache condivisa su disco; le varianti per evento si
+producono in parallelo su più processi.
+
+Uso::
+
+    python -m festival.share_cards --out share_cards [--workers 4]
+"""
+
+import argparse
+import concurrent.futures
+import functools
+import io
+import os
+import re
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+from festival import disk_cache
+from festival.data import compute_kpis, df_historical, load_events
+from festival.logo_wall import REGISTRY_PATH, TIERS, load_registry
+
+# Formato -> dimensioni in pixel consigliate dalle piattaforme
+RATIOS = {
+    "1:1": (1080, 1080),
+    "4:5": (1080, 1350),
+    "9:16": (1080, 1920),
+    "1.91:1": (1200, 628),
+}
+RATIO_LABELS = {
+    "1:1": "1:1 · post",
+    "4:5": "4:5 · post verticale",
+    "9:16": "9:16 · storie e reel",
+    "1.91:1": "1.91:1 · anteprima dei link (Open Graph)",
+}
+
+FESTIVAL_LOGO = "Logo_footprint_.png"
+# Nella fascia dei partner vanno i loghi del livello più alto del registro
+SPONSOR_TIER = next(iter(TIERS))
+
+# Colori del tema dell'app
+BACKGROUND_TOP = (26, 82, 118)     # #1a5276
+BACKGROUND_BOTTOM = (44, 62, 80)   # #2c3e50
+ACCENT = (93, 173, 226)            # #5dade2
+TILE = (255, 255, 255)
+TILE_VALUE = (26, 82, 118)
+TILE_LABEL = (86, 101, 115)        # #566573
+BAND = (248, 249, 250)             # #f8f9fa
+
+# Un font TrueType a scelta (ad esempio Montserrat come nel CSS dell'app); senza,
+# si usa quello incluso in Pillow
+FONT_PATH = os.environ.get("FESTIVAL_CARD_FONT")
+
+MONTHS = ["gennaio", "febbraio", "marzo", "aprile", "maggio", "giugno", "luglio",
+          "agosto", "settembre", "ottobre", "novembre", "dicembre"]
+
+
+def _number(value):
+    return f"{value:,}".replace(",", ".")
+
+
+def _millions(value):
+    return f"{value / 1_000_000:.1f}".rstrip("0").rstrip(".") + " Mln"
+
+
+def card_content(kpis, events, event=None):
+    """Testi di una card: titolo, date dell'edizione, evento opzionale e KPI."""
+    edition = events[events["edizione"] == kpis["anno"]]
+    first, last = edition["inizio"].min(), edition["fine"].max()
+    content = {
+        "titolo": f"Festival del Capo di Leuca {kpis['anno']}",
+        "date": f"{first.day} {MONTHS[first.month - 1]} - {last.day} {MONTHS[last.month - 1]} {last.year}",
+        "kpi": [
+            (_number(kpis["pubblico"]), "Pubblico in presenza"),
+            (_millions(kpis["copertura"]), "Copertura digitale"),
+            (str(kpis["eventi"]), "Eventi"),
+            (str(kpis["comuni"]), "Comuni"),
+        ],
+    }
+    if event is not None:
+        content["evento"] = [
+            f"{event['tipo'].capitalize()} a {event['comune']}",
+            f"{event['inizio']:%d/%m} ore {event['inizio']:%H:%M} · {event['sede']}",
+        ]
+    return content
+
+
+@functools.lru_cache(maxsize=32)
+def _font(size):
+    if FONT_PATH:
+        return ImageFont.truetype(FONT_PATH, size)
+    return ImageFont.load_default(size)
+
+
+def _fit(draw, text, max_width, size):
+    """Font più grande (fino a ``size``) con cui il testo sta in ``max_width``."""
+    while size > 12 and draw.textlength(text, font=_font(size)) > max_width:
+        size -= 2
+    return _font(size)
+
+
+@functools.lru_cache(maxsize=32)
+def _logo(path, max_width, max_height):
+    # I loghi si leggono e ridimensionano una volta per processo e per misura
+    image = Image.open(path).convert("RGBA")
+    image.thumbnail((max_width, max_height), Image.LANCZOS)
+    return image
+
+
+def _gradient(width, height):
+    top = Image.new("RGB", (width, height), BACKGROUND_TOP)
+    bottom = Image.new("RGB", (width, height), BACKGROUND_BOTTOM)
+    mask = Image.linear_gradient("L").resize((width, height))
+    return Image.composite(bottom, top, mask)
+
+
+def _text_center(draw, text, cx, y, font, fill):
+    draw.text((cx, y), text, font=font, fill=fill, anchor="ma")
+    top, bottom = font.getbbox(text)[1], font.getbbox(text)[3]
+    return y + (bottom - top)
+
+
+def _kpi_grid(draw, kpis, box, gap):
+    """Griglia 2x2 di riquadri con valore e etichetta."""
+    x0, y0, x1, y1 = box
+    w = (x1 - x0 - gap) // 2
+    h = (y1 - y0 - gap) // 2
+    for i, (value, label) in enumerate(kpis):
+        tx = x0 + (i % 2) * (w + gap)
+        ty = y0 + (i // 2) * (h + gap)
+        draw.rounded_rectangle((tx, ty, tx + w, ty + h), radius=gap, fill=TILE)
+        value_font = _fit(draw, value, w * 0.85, int(h * 0.42))
+        label_font = _fit(draw, label, w * 0.85, int(h * 0.14))
+        draw.text((tx + w / 2, ty + h * 0.46), value, font=value_font, fill=TILE_VALUE, anchor="ms")
+        draw.text((tx + w / 2, ty + h * 0.72), label, font=label_font, fill=TILE_LABEL, anchor="ms")
+
+
+def _sponsor_band(card, draw, box, logos):
+    x0, y0, x1, y1 = box
+    draw.rectangle(box, fill=BAND)
+    pad = (y1 - y0) // 6
+    slot = (x1 - x0) // max(len(logos), 1)
+    for i, path in enumerate(logos):
+        logo = _logo(path, int(slot * 0.7), y1 - y0 - 2 * pad)
+        card.paste(logo, (x0 + i * slot + (slot - logo.width) // 2, y0 + (y1 - y0 - logo.height) // 2), logo)
+
+
+def sponsor_logos(registry_path=REGISTRY_PATH):
+    """Loghi dei main sponsor del registro, nell'ordine del file."""
+    registry = load_registry(registry_path)
+    return tuple(registry.loc[registry["livello"] == SPONSOR_TIER, "logo"])
+
+
+def render_card(content, ratio, logo=FESTIVAL_LOGO, sponsors=None):
+    """PNG di una card nel formato ``ratio``; senza ``sponsors``, i main sponsor del registro."""
+    sponsors = sponsor_logos() if sponsors is None else sponsors
+    width, height = RATIOS[ratio]
+    card = _gradient(width, height)
+    draw = ImageDraw.Draw(card)
+    margin = int(min(width, height) * 0.06)
+    band_height = int(height * (0.16 if width > height else 0.11))
+    band_top = height - band_height
+    _sponsor_band(card, draw, (0, band_top, width, height), [p for p in sponsors if os.path.exists(p)])
+
+    landscape = width > height
+    # In orizzontale logo e testi a sinistra e KPI a destra; altrimenti tutto in colonna
+    text_width = (width // 2 - margin) if landscape else width - 2 * margin
+    cx = margin + text_width // 2 if landscape else width // 2
+    y = margin
+    if os.path.exists(logo):
+        emblem = _logo(logo, text_width, int((band_top - 2 * margin) * (0.42 if landscape else 0.22)))
+        card.paste(emblem, (int(cx - emblem.width / 2), y), emblem)
+        y += emblem.height + margin // 2
+
+    title_font = _fit(draw, content["titolo"], text_width, int(width * (0.045 if landscape else 0.07)))
+    y = _text_center(draw, content["titolo"], cx, y, title_font, TILE) + margin // 3
+    date_font = _fit(draw, content["date"], text_width, int(title_font.size * 0.6))
+    y = _text_center(draw, content["date"], cx, y, date_font, ACCENT) + margin // 2
+    for line in content.get("evento", []):
+        event_font = _fit(draw, line, text_width, int(title_font.size * 0.62))
+        y = _text_center(draw, line, cx, y, event_font, TILE) + margin // 4
+
+    if landscape:
+        grid = (width // 2 + margin // 2, margin, width - margin, band_top - margin)
+    else:
+        grid = (margin, y + margin // 2, width - margin, band_top - margin)
+        # Griglia quadrata al più, centrata nello spazio disponibile
+        side = min(grid[2] - grid[0], grid[3] - grid[1])
+        gx = (width - side) // 2
+        grid = (gx, grid[1], gx + side, grid[1] + side) if side < grid[3] - grid[1] else (gx, grid[1], gx + side, grid[3])
+    _kpi_grid(draw, content["kpi"], grid, margin // 2)
+
+    buffer = io.BytesIO()
+    card.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@disk_cache.disk_cached("card", depends=(FESTIVAL_LOGO, REGISTRY_PATH, *([FONT_PATH] if FONT_PATH else [])))
+def _card_png(content, ratio, sponsors, sponsor_digests):
+    return render_card(content, ratio, sponsors=sponsors)
+
+
+def card_png(content, ratio):
+    """Card in cache per hash di contenuto, formato, registro e file dei loghi e font."""
+    sponsors = sponsor_logos()
+    return _card_png(content, ratio, sponsors, tuple(disk_cache.file_digest(p) for p in sponsors))
+
+
+def edition_events(events, edition):
+    """Eventi di un'edizione in ordine di data, come nelle varianti per evento."""
+    return events[events["edizione"] == edition].sort_values("inizio").reset_index(drop=True)
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _render_task(task):
+    name, content, ratio = task
+    return name, card_png(content, ratio)
+
+
+def render_batch(out_dir, per_event=True, ratios=tuple(RATIOS), workers=None, events=None):
+    """Card generali e, con ``per_event``, una per evento dell'ultima edizione, in parallelo.
+
+    Restituisce i percorsi dei file scritti.
+    """
+    events = events if events is not None else load_events()
+    kpis = compute_kpis(df_historical, events)
+    tasks = [(f"festival-{_slug(r)}", card_content(kpis, events), r) for r in ratios]
+    if per_event:
+        for i, event in enumerate(edition_events(events, kpis["anno"]).to_dict("records"), start=1):
+            content = card_content(kpis, events, event)
+            name = f"evento-{i:02d}-{_slug(event['comune'])}"
+            tasks += [(f"{name}-{_slug(r)}", content, r) for r in ratios]
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        for name, png in pool.map(_render_task, tasks, chunksize=4):
+            path = os.path.join(out_dir, f"{name}.png")
+            with open(path, "wb") as f:
+                f.write(png)
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="share_cards")
+    parser.add_argument("--workers", type=int, default=None, help="processi (default: uno per CPU)")
+    parser.add_argument("--solo-generali", action="store_true", help="senza le varianti per evento")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = render_batch(args.out, per_event=not args.solo_generali, workers=args.workers)
+    print(f"{len(paths)} card in {args.out}/ in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
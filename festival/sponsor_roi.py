@@ -0,0 +1,159 @@
+"""Simulatore Monte Carlo della visibilità offerta da ciascun pacchetto di sponsorizzazione.
+
+Il pubblico e la copertura di ogni evento seguono distribuzioni lognormali
+stimate sul dataset degli eventi, per tipologia; uno shock comune a tutta
+l'edizione, stimato sullo storico, rende i risultati degli eventi correlati
+tra loro. Ogni prova estrae tutti gli eventi in una matrice e le somme
+cumulative per tipologia danno in un colpo il totale di qualsiasi pacchetto:
+100.000 prove per tutti i pacchetti richiedono una frazione di secondo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from festival.data import df_historical, load_events, sponsorship_packages
+
+DEFAULT_TRIALS = 100_000
+
+# Impressioni per spettatore e quota della copertura social per evento sponsorizzato:
+# i pacchetti standard hanno il logo su materiali e post, il MAIN SPONSOR aggiunge
+# stand, spot video, menzioni e una campagna social dedicata
+EXPOSURE = {
+    "standard": {"presenza": 1.0, "social": 1.0},
+    "esclusive": {"presenza": 3.0, "social": 1.25},
+}
+
+# Scenario di riferimento: crescita rispetto alle previsioni 2025 (%) e tassi medi
+# di riscatto di coupon e codici sconto, in presenza e online
+DEFAULT_SCENARIO = {
+    "crescita_pubblico": 0.0,
+    "crescita_copertura": 0.0,
+    "riscatto_presenza": 0.02,
+    "riscatto_online": 0.0002,
+}
+
+# Incertezza relativa (coefficiente di variazione) dei tassi di riscatto
+RATE_CV = 0.3
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def package_label(package):
+    if package["tipologia"] == "Combinato":
+        return package["pacchetto"]
+    return f"{package['pacchetto']} · {package['tipologia']}"
+
+
+def _lognormal_fit(values):
+    logs = np.log(np.asarray(values, dtype=float))
+    return logs.mean(), logs.std(ddof=1) if len(logs) > 1 else 0.0
+
+
+def fit_distributions(events=None, df=df_historical):
+    """Parametri lognormali per evento (per tipologia) e shock di edizione dallo storico."""
+    events = events if events is not None else load_events()
+    last = events[events["edizione"] == events["edizione"].max()]
+    per_type = {
+        kind: {
+            "eventi": len(group),
+            "pubblico": _lognormal_fit(group["pubblico"]),
+            "copertura": _lognormal_fit(group["copertura"]),
+        }
+        for kind, group in last.groupby("tipo")
+    }
+    # Variabilità tra edizioni della media per evento; il 2023 non ha dati di copertura
+    per_event_audience = df["Pubblico in Presenza"] / df["Eventi Totali"]
+    with_reach = df[df["Copertura Totale"] > 0]
+    per_event_reach = with_reach["Copertura Totale"] / with_reach["Eventi Totali"]
+    shock = {
+        "pubblico": _lognormal_fit(per_event_audience)[1],
+        "copertura": _lognormal_fit(per_event_reach)[1],
+    }
+    return {"tipi": per_type, "shock": shock}
+
+
+def _edition_shock(rng, sigma, trials):
+    # Media 1: lo shock sposta l'edizione sopra o sotto le previsioni senza distorcerle
+    return rng.lognormal(-sigma ** 2 / 2, sigma, trials)
+
+
+def _beta(rng, mean, trials):
+    # Beta con la media data e deviazione standard pari a RATE_CV volte la media
+    concentration = (1 - mean) / (mean * RATE_CV ** 2) - 1
+    return rng.beta(mean * concentration, (1 - mean) * concentration, trials)
+
+
+def simulate(scenario=None, trials=DEFAULT_TRIALS, packages=sponsorship_packages, fit=None, seed=0):
+    """Impressioni, costo per mille impressioni (CPM) e riscatti attesi per pacchetto.
+
+    Restituisce ``{etichetta: {"impressioni", "cpm", "riscatti"}}`` con un array
+    di ``trials`` valori per metrica. Tutti i pacchetti condividono le stesse
+    estrazioni, così le differenze tra pacchetti non dipendono dal rumore.
+    """
+    scenario = {**DEFAULT_SCENARIO, **(scenario or {})}
+    fit = fit or fit_distributions()
+    rng = np.random.default_rng(seed)
+
+    audience_shock = _edition_shock(rng, fit["shock"]["pubblico"], trials)[:, None]
+    audience_shock *= 1 + scenario["crescita_pubblico"] / 100
+    reach_shock = _edition_shock(rng, fit["shock"]["copertura"], trials)[:, None]
+    reach_shock *= 1 + scenario["crescita_copertura"] / 100
+
+    # Somme cumulative per tipologia: la colonna k è il totale dei primi k eventi
+    cumulative = {}
+    for kind, params in fit["tipi"].items():
+        shape = (trials, params["eventi"])
+        audience = rng.lognormal(*params["pubblico"], shape) * audience_shock
+        reach = rng.lognormal(*params["copertura"], shape) * reach_shock
+        zeros = np.zeros((trials, 1))
+        cumulative[kind] = (
+            np.hstack([zeros, np.cumsum(audience, axis=1)]),
+            np.hstack([zeros, np.cumsum(reach, axis=1)]),
+        )
+
+    rate_presence = _beta(rng, scenario["riscatto_presenza"], trials)
+    rate_online = _beta(rng, scenario["riscatto_online"], trials)
+
+    results = {}
+    for package in packages:
+        audience = np.zeros(trials)
+        reach = np.zeros(trials)
+        for kind, count in (("concerto", package["concerti"]), ("masterclass", package["masterclass"])):
+            if count and kind in cumulative:
+                cum_audience, cum_reach = cumulative[kind]
+                column = min(count, cum_audience.shape[1] - 1)
+                audience += cum_audience[:, column]
+                reach += cum_reach[:, column]
+        exposure = EXPOSURE["esclusive" if package.get("esclusive") else "standard"]
+        impressions = audience * exposure["presenza"] + reach * exposure["social"]
+        results[package_label(package)] = {
+            "impressioni": impressions,
+            "cpm": package["prezzo"] / impressions * 1000,
+            "riscatti": audience * rate_presence + reach * exposure["social"] * rate_online,
+        }
+    return results
+
+
+def summarize(results, percentiles=PERCENTILES):
+    """Percentili di ogni metrica per pacchetto, in formato lungo."""
+    rows = []
+    for label, metrics in results.items():
+        for metric, values in metrics.items():
+            row = {"pacchetto": label, "metrica": metric, "media": values.mean()}
+            row.update(zip((f"p{p}" for p in percentiles), np.percentile(values, percentiles)))
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def histograms(results, metric, bins=60):
+    """Istogrammi di una metrica su scala logaritmica comune a tutti i pacchetti.
+
+    Restituisce ``(centri, {etichetta: frequenze relative})``: sono pochi
+    numeri da tenere in cache al posto delle prove.
+    """
+    values = {label: metrics[metric] for label, metrics in results.items()}
+    low = min(np.percentile(v, 0.1) for v in values.values())
+    high = max(np.percentile(v, 99.9) for v in values.values())
+    edges = np.geomspace(max(low, 1e-9), high, bins + 1)
+    centers = np.sqrt(edges[:-1] * edges[1:])
+    return centers, {label: np.histogram(v, edges)[0] / len(v) for label, v in values.items()}
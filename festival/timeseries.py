@@ -0,0 +1,188 @@
+"""Serie temporali ad alta risoluzione di copertura e presenze, ridotte lato server.
+
+Le curve orarie di più edizioni arrivano a centinaia di migliaia di punti:
+al browser se ne mandano al più qualche migliaio. Per ogni serie si costruisce
+una piramide di livelli min-max (ogni livello raggruppa ``PYRAMID_FACTOR``
+volte più punti del precedente), così una finestra qualsiasi si serve dal
+livello più fine che sta nel budget di punti, e l'ultimo passo usa LTTB
+(Largest-Triangle-Three-Buckets) per conservare la forma della curva.
+Sopra ``WEBGL_THRESHOLD`` punti il grafico usa tracce WebGL.
+
+La serie viene da ``data/serie.csv`` (``istante,metrica,valore``, ad esempio
+un export degli insight social) se presente; altrimenti si stima ora per ora
+dal dataset degli eventi.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+SERIES_PATH = os.path.join("data", "serie.csv")
+
+SERIES = {
+    "copertura": "Copertura social",
+    "presenze": "Pubblico in presenza",
+}
+
+PYRAMID_FACTOR = 4
+# Punti oltre i quali Plotly passa da SVG a WebGL
+WEBGL_THRESHOLD = 5000
+# Budget di punti per una larghezza tipica del grafico
+DEFAULT_POINTS = 2000
+
+# Stima della copertura: i contenuti di un evento raggiungono utenti per una
+# settimana, con un'emivita di un giorno
+REACH_HALF_LIFE_H = 24
+REACH_WINDOW_H = 7 * 24
+
+
+def minmax(x, y, n_buckets):
+    """Minimo e massimo di ``y`` in ``n_buckets`` gruppi consecutivi, in ordine di ``x``."""
+    n = len(x)
+    if n <= 2 * n_buckets:
+        return x, y
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    # Gruppi di pari lunghezza: l'ultimo si completa con valori che non vincono mai
+    padded = np.full(n_buckets * size, np.inf)
+    padded[:n] = y
+    lo = padded.reshape(n_buckets, size).argmin(axis=1)
+    padded[n:] = -np.inf
+    hi = padded.reshape(n_buckets, size).argmax(axis=1)
+    base = np.arange(n_buckets) * size
+    keep = np.unique(np.concatenate([base + lo, base + hi]))
+    return x[keep], y[keep]
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: ``n_out`` punti che conservano la forma della curva.
+
+    La scelta di ogni gruppo dipende da quella del precedente, quindi il ciclo
+    è sui gruppi; dentro ogni gruppo le aree dei triangoli sono vettoriali.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    # Gli istanti datetime64 diventano secondi per il calcolo delle aree
+    xf = (x.astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x).astype(float)
+    yf = y.astype(float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    # Media del gruppo successivo, il terzo vertice del triangolo, per tutti i gruppi insieme
+    sums_x = np.add.reduceat(xf[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(yf[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, xf[-1])
+    avg_y = np.append(sums_y / counts, yf[-1])
+
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (xf[a] - avg_x[i + 1]) * (yf[lo:hi] - yf[a]) - (xf[a] - xf[lo:hi]) * (avg_y[i + 1] - yf[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+
+class Pyramid:
+    """Livelli min-max di una serie, dal dato grezzo al riassunto più grossolano."""
+
+    def __init__(self, x, y, factor=PYRAMID_FACTOR, coarsest=DEFAULT_POINTS):
+        order = np.argsort(x, kind="stable")
+        x, y = np.asarray(x)[order], np.asarray(y, dtype=float)[order]
+        self.levels = [(x, y)]
+        size = factor
+        while len(self.levels[-1][0]) > coarsest:
+            self.levels.append(minmax(x, y, len(x) // size))
+            size *= factor
+
+    def __len__(self):
+        return len(self.levels[0][0])
+
+    @property
+    def extent(self):
+        x = self.levels[0][0]
+        return x[0], x[-1]
+
+    def query(self, x0=None, x1=None, max_points=DEFAULT_POINTS):
+        """Fino a ``max_points`` punti della finestra ``[x0, x1]``, col massimo dettaglio.
+
+        Il livello più fine che sta in ``max_points`` ne può avere fino a
+        ``factor`` volte meno: in quel caso si riduce con LTTB il livello
+        precedente, così il grafico usa tutti i punti disponibili.
+        """
+        finer = None
+        for x, y in self.levels:
+            lo = 0 if x0 is None else max(np.searchsorted(x, x0, side="left") - 1, 0)
+            hi = len(x) if x1 is None else min(np.searchsorted(x, x1, side="right") + 1, len(x))
+            if hi - lo <= max_points:
+                if finer is None:
+                    return x[lo:hi], y[lo:hi]
+                return lttb(*finer, max_points)
+            finer = x[lo:hi], y[lo:hi]
+        # Anche il livello più grossolano è troppo denso: ultimo passo con LTTB
+        return lttb(*finer, max_points)
+
+
+def _hours(t):
+    return t.to_numpy("datetime64[h]").astype(np.int64)
+
+
+def estimated_series(events):
+    """Copertura e presenze ora per ora stimate dagli eventi, dal primo all'ultimo evento.
+
+    Le presenze sono il pubblico degli eventi in corso; la copertura di ogni
+    evento decade esponenzialmente nei giorni successivi.
+    """
+    start, end = _hours(events["inizio"]), _hours(events["fine"])
+    first = start.min()
+    n = int(end.max() - first) + REACH_WINDOW_H
+    hours = np.arange(n) + first
+
+    # Presenze: il pubblico di un evento conta in ogni sua ora
+    duration = np.maximum(end - start, 1)
+    within = np.arange(duration.sum()) - np.repeat(np.cumsum(duration) - duration, duration)
+    offsets = np.repeat(start - first, duration) + within
+    presence = np.bincount(offsets, weights=np.repeat(events["pubblico"].to_numpy(float), duration), minlength=n)
+
+    # Copertura: impulsi all'inizio degli eventi convoluti con il nucleo di decadimento
+    impulses = np.bincount(start - first, weights=events["copertura"].to_numpy(float), minlength=n)
+    kernel = 0.5 ** (np.arange(REACH_WINDOW_H) / REACH_HALF_LIFE_H)
+    reach = np.convolve(impulses, kernel / kernel.sum())[:n]
+
+    timestamps = hours.astype("datetime64[h]").astype("datetime64[s]")
+    return {"copertura": (timestamps, reach), "presenze": (timestamps, presence)}
+
+
+def load_series(events, path=SERIES_PATH):
+    """Serie per metrica ``{metrica: (istanti, valori)}`` e se sono stimate.
+
+    Le serie misurate vengono da ``path``; senza il file si stimano dagli eventi.
+    """
+    if not os.path.exists(path):
+        return estimated_series(events), True
+    df = pd.read_csv(path, parse_dates=["istante"])
+    return {
+        metric: (group["istante"].to_numpy("datetime64[s]"), group["valore"].to_numpy(float))
+        for metric, group in df.groupby("metrica")
+    }, False
+
+
+def figure(x, y, name, color="#d35400", height=400):
+    """Grafico della serie: SVG per pochi punti, WebGL sopra ``WEBGL_THRESHOLD``."""
+    trace = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    fig = go.Figure(trace(x=x, y=y, mode="lines", name=name, line=dict(color=color, width=1.5)))
+    fig.update_layout(
+        height=height,
+        yaxis_title=name,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#2c3e50'),
+        margin=dict(t=30),
+    )
+    return fig
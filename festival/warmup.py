@@ -0,0 +1,173 @@
+"""Riscaldamento delle cache prima di aprire il traffico.
+
+Dopo un deploy o un riavvio i primi visitatori (spesso gli sponsor appena
+contattati) pagherebbero il calcolo di grafici, layer della mappa, percorsi e
+simulazioni. Questo comando li calcola tutti, per ogni edizione, e li scrive
+nella cache condivisa su disco: i processi Streamlit li trovano già pronti.
+
+Al termine scrive un file di prontezza legato ai sorgenti e ai dati correnti,
+solo se la cache su disco è disponibile (altrimenti non c'è nulla di condiviso
+e il comando esce con codice 1); finché manca (o è di un deploy precedente) ``--check`` esce con codice 1 e
+l'endpoint ``/api/v1/pronto`` risponde 503, così il bilanciatore può tenere
+fuori il server.
+
+Uso, come comando prima dell'avvio::
+
+    python -m festival.warmup && streamlit run "Festival_infographics stiylish.py"
+    python -m festival.warmup --check
+"""
+
+import argparse
+import functools
+import json
+import logging
+import os
+import sys
+import time
+
+from festival import disk_cache
+from festival.allocation import MAX_TRANSFER_MIN
+from festival.boundaries import LEVELS_PATH
+from festival.catchment import META_PATH, RASTER_PATH
+from festival.choropleth import METHODS, METRICS
+from festival.data import EVENTS_PATH
+from festival.logo_wall import REGISTRY_PATH
+from festival.share_cards import RATIOS
+from festival.sponsor_roi import DEFAULT_SCENARIO
+
+READY_FILE = "pronto.json"
+# Logger di Streamlit che fuori da `streamlit run` avvisano della sessione mancante
+# e della cache in memoria usata al posto di quella del runtime
+BARE_MODE_LOGGERS = (
+    "streamlit.runtime.scriptrunner_utils.script_run_context",
+    "streamlit.runtime.caching.cache_data_api",
+)
+
+# File di dati da cui dipendono gli artefatti: se cambiano serve un nuovo riscaldamento
+DATA_FILES = (EVENTS_PATH, LEVELS_PATH, RASTER_PATH, META_PATH, REGISTRY_PATH)
+
+
+def ready_path():
+    return os.path.join(disk_cache.cache_directory(), READY_FILE)
+
+
+def _fingerprint():
+    return {"codice": disk_cache.CODE_DIGEST, "dati": {path: disk_cache.file_digest(path) for path in DATA_FILES}}
+
+
+def is_ready():
+    """Vero se il riscaldamento è stato completato per i sorgenti e i dati correnti."""
+    try:
+        with open(ready_path(), encoding="utf-8") as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return {key: marker.get(key) for key in ("codice", "dati")} == _fingerprint()
+
+
+def artifacts():
+    """Gruppi di artefatti da calcolare: ``(nome, [funzioni senza argomenti])``."""
+    # Import qui: il controllo di prontezza (anche dall'API) non deve caricare Streamlit
+    from festival.app_data import (
+        allocation_plan,
+        catchment_overlay,
+        choropleth_layer,
+        historical_figures,
+        load_boundary_levels,
+        load_event_data,
+        logo_wall,
+        share_card,
+        sponsor_simulation,
+        venue_route,
+    )
+
+    # Gli argomenti sono gli stessi che passano le pagine, così le chiavi in cache coincidono
+    editions = sorted(load_event_data()["edizione"].unique())
+    levels = load_boundary_levels()
+    level_ids = range(len(levels)) if levels else [None]
+    return [
+        ("Grafici storici", [historical_figures]),
+        ("Coropleta", [
+            functools.partial(choropleth_layer, metric, edition, method, level)
+            for edition in editions for metric in METRICS for method in METHODS for level in level_ids
+        ]),
+        ("Percorsi tra le sedi", [functools.partial(venue_route, edition) for edition in editions]),
+        ("Simulazione sponsor", [functools.partial(sponsor_simulation, **DEFAULT_SCENARIO)]),
+        ("Bacini d'utenza", [functools.partial(catchment_overlay, ())]),
+        # Il piano senza richieste degli sponsor, quello mostrato all'apertura
+        ("Piano prossima edizione", [functools.partial(allocation_plan, (), MAX_TRANSFER_MIN)]),
+        # Solo le card generali: quelle per evento si producono con `python -m festival.share_cards`
+        ("Card per i social", [functools.partial(share_card, ratio) for ratio in RATIOS]),
+        ("Muro dei loghi", [logo_wall]),
+    ]
+
+
+def warm_up(report=print):
+    """Calcola tutti gli artefatti e, se la cache su disco è disponibile, segna il server come pronto.
+
+    Restituisce i tempi per gruppo.
+    """
+    # Durante il riscaldamento il server non è pronto
+    try:
+        os.remove(ready_path())
+    except FileNotFoundError:
+        pass
+
+    start = time.perf_counter()
+    groups = artifacts()
+    # Import di Streamlit, Plotly e Folium e lettura dei dati, pagati anche dal primo visitatore
+    timings = {"Import e dati": time.perf_counter() - start}
+    report(f"{'Import e dati':<24}{'':>15} {timings['Import e dati'] * 1000:>9.0f} ms")
+    for name, tasks in groups:
+        group_start = time.perf_counter()
+        for task in tasks:
+            task()
+        timings[name] = time.perf_counter() - group_start
+        report(f"{name:<24}{len(tasks):>5} artefatti {timings[name] * 1000:>9.0f} ms")
+    total = time.perf_counter() - start
+    report(f"{'Totale':<24}{'':>15} {total * 1000:>9.0f} ms")
+
+    # Senza cache su disco gli artefatti restano in questo processo: il server non è pronto
+    if disk_cache.default_cache() is None:
+        return timings
+    os.makedirs(disk_cache.cache_directory(), exist_ok=True)
+    marker = {**_fingerprint(), "secondi": round(total, 3), "gruppi": {k: round(v, 3) for k, v in timings.items()}}
+    # Scrittura atomica: chi controlla la prontezza non legge mai un file a metà
+    tmp = f"{ready_path()}.{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(marker, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, ready_path())
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="esce con 0 se il server è pronto, 1 altrimenti")
+    args = parser.parse_args()
+
+    if args.check:
+        ready = is_ready()
+        print("pronto" if ready else "non pronto")
+        sys.exit(0 if ready else 1)
+
+    # Fuori da `streamlit run` le funzioni in cache avvisano a ogni chiamata che manca il
+    # contesto della sessione: qui è atteso. Gli altri avvisi (cache non disponibile) restano.
+    # Un filtro e non il livello: Streamlit reimposta il livello dei suoi logger all'import
+    # e di nuovo quando legge la configurazione
+    for name in BARE_MODE_LOGGERS:
+        logging.getLogger(name).addFilter(lambda record: record.levelno >= logging.ERROR)
+    # Né l'invito a usare `streamlit run`, che qui non serve
+    from streamlit import config
+    config.set_option("global.showWarningOnDirectExecution", False)
+    warm_up()
+    cache = disk_cache.default_cache()
+    if cache is None:
+        print("Cache su disco non disponibile: nulla di condiviso con i processi Streamlit, server non pronto")
+        sys.exit(1)
+    info = cache.info()
+    print(f"Cache su disco: {info['artefatti']} artefatti, {info['byte'] / 1024:.0f} KB in {cache.path}")
+    print(f"Pronto: {ready_path()}")
+
+
+if __name__ == "__main__":
+    main()